@@ -0,0 +1,322 @@
+"""Resume field extraction, embedding and scoring pipeline shared by the Streamlit app and batch_screen.py.
+
+Nothing here touches Streamlit; callers pass in an embedding backend (see embedding_backends.py),
+a CohereService for generated feedback, and optionally an EmbeddingCache.
+"""
+import re
+import hashlib
+from functools import lru_cache
+import numpy as np
+from similarity import similarity_matrix, top_k, best_matches
+from keywords import default_matcher, taxonomy_fingerprint
+from document import parse_document
+
+GENERATE_MODEL = "command"
+
+# --- Helper functions for info extraction and analysis ---
+def extract_email(text):
+    match = re.search(r"[\w\.-]+@[\w\.-]+", text)
+    return match.group(0) if match else None
+
+def extract_phone(text):
+    match = re.search(r"(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s-]?)?\d{3}[\s-]?\d{4}", text)
+    return match.group(0) if match else None
+
+def extract_name(text):
+    lines = parse_document(text).lines
+    for line in lines[:5]:
+        if len(line.text.split()) in [2, 3] and all(w[0].isupper() for w in line.text.split() if w):
+            return line.text
+    return lines[0].text if lines else None
+
+_SKILL_SEPARATORS = re.compile(r"[,;|•·▪\t](?![^()]*\))|\s{2,}")  # not inside "AWS (S3, Glue)"
+
+def _split_words(line):
+    """Split a separator-less list ("Python SQL Machine Learning") on spaces, keeping
+    multi-word taxonomy terms whole."""
+    phrases = sorted(span for spans in default_matcher().scan(line).values() for span in spans
+                     if " " in line[span[0]:span[1]])
+    items, pos = [], 0
+    for start, end in phrases:
+        if start >= pos:
+            items += line[pos:start].split()
+            items.append(line[start:end])
+            pos = end
+    return items + line[pos:].split()
+
+def extract_skills(text):
+    # Items of every Skills section, split on list separators; "Languages: Python" keeps "Python"
+    skills = []
+    for section in parse_document(text).sections_named("skills"):
+        for line in section.lines:
+            content = line.text.rpartition(":")[2]
+            items = _SKILL_SEPARATORS.split(content)
+            if len(items) == 1:
+                items = _split_words(content)
+            for item in items:
+                item = item.strip(" -*")
+                if 1 < len(item) <= 40:
+                    skills.append(item)
+    return list(dict.fromkeys(skills))[:15]  # first 15 distinct, in document order
+
+def _section_lines(text, name, limit):
+    section = parse_document(text).section(name)
+    return [line.text for line in section.lines[:limit]] if section else []
+
+def extract_education(text):
+    return _section_lines(text, "education", 3)
+
+def extract_experience(text):
+    return _section_lines(text, "experience", 5)
+
+def split_into_sentences(text):
+    return [sentence.text for sentence in parse_document(text).sentences]
+
+_CAPITALIZED_WORD = re.compile(r'\b[A-Z][a-zA-Z0-9\+#]*\b')
+
+@lru_cache(maxsize=256)
+def extract_keywords(text):
+    # Memoized: the same resume/JD text is scored and shown in several places per run.
+    # Only the taxonomy lookup is a single automaton scan; the Skills-section items and
+    # capitalized words are kept on top of it because keyword overlap (and so every
+    # score) has always counted them.
+    skills = set(extract_skills(text))
+    skills.update(w for w in _CAPITALIZED_WORD.findall(text) if len(w) > 2)
+    skills.update(default_matcher().scan(text))
+    return frozenset(map(str.lower, skills))
+
+class FeedbackFilter:
+    """Incremental form of clean_ai_feedback for text that arrives in pieces.
+
+    Drops ```code``` blocks, {...} blocks and <tags>. Text that could still turn
+    out to be inside one of them is held back until it is closed or flushed."""
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, chunk):
+        text = self._pending + chunk
+        out = []
+        i = 0
+        while i < len(text):
+            ch = text[i]
+            if ch == "`" and text.startswith("```", i):
+                end = text.find("```", i + 3)
+                if end == -1:
+                    break
+                i = end + 3
+                continue
+            if ch == "`" and "```".startswith(text[i:]):
+                break  # may be the start of a fence
+            if ch == "{":
+                end = text.find("}", i + 1)
+                if end == -1:
+                    break
+                i = end + 1
+                continue
+            if ch == "<" and not text.startswith("<>", i):
+                end = text.find(">", i + 1)
+                if end == -1:
+                    break
+                i = end + 1
+                continue
+            out.append(ch)
+            i += 1
+        self._pending = text[i:]
+        return "".join(out)
+
+    def flush(self):
+        # Whatever is still held opens a block that never closed; keep the opener as plain text
+        out = []
+        while self._pending:
+            head, self._pending = self._pending[0], self._pending[1:]
+            out.append(head + self.feed(""))
+        return "".join(out)
+
+def clean_ai_feedback(text):
+    feedback_filter = FeedbackFilter()
+    return (feedback_filter.feed(text) + feedback_filter.flush()).strip()
+
+def text_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+# --- Embedding and scoring ---
+def embed_texts(backend, texts, cache=None):
+    """Embed ``texts`` with an embedding backend, going through ``cache`` when given."""
+    if cache is not None:
+        return cache.embed(texts, backend.name, backend.input_type, backend.embed)
+    return backend.embed(texts)
+
+def sharp_sigmoid(x):
+    return 1 / (1 + np.exp(-x * 10 + 2))  # sharper and shifted
+
+def keyword_overlap(resume_keywords, jd_keywords):
+    if not jd_keywords:
+        return 0
+    return len(resume_keywords & jd_keywords) / len(jd_keywords)
+
+def hybrid_score(embedding_score, overlap):
+    combined_score = 0.6 * embedding_score + 0.4 * overlap
+    return int(np.clip(combined_score * 100, 0, 100))
+
+# --- Scoring ---
+# Bump SCORING_FORMULA whenever a change below can move a score. SCORING_VERSION also
+# carries the skills taxonomy's fingerprint (RESUME_SKILLS_TAXONOMY changes keyword
+# overlap), so cached and persisted scores from different versions are never compared or reused.
+SCORING_FORMULA = 4
+SCORING_VERSION = f"{SCORING_FORMULA}.{taxonomy_fingerprint()}"
+TOP_N_SIMILARITIES = 5
+UNRELATED_OVERLAP = 0.1  # below this keyword overlap, or
+UNRELATED_MIN_SIM = 0.05  # below this worst sentence similarity, a pair counts as unrelated
+UNRELATED_RANGE = (35, 45)  # unrelated pairs score here, ordered by their hybrid score
+COVERAGE_SIM = 0.4  # a JD sentence is covered if some resume sentence is at least this similar
+# A backend's unrelated_min_sim / coverage_sim attributes override the two similarity thresholds
+
+def _thresholds(backend):
+    return (getattr(backend, "unrelated_min_sim", UNRELATED_MIN_SIM),
+            getattr(backend, "coverage_sim", COVERAGE_SIM))
+
+def scoring_version(backend=None):
+    """SCORING_VERSION, plus the backend name when scoring with that backend's thresholds."""
+    return SCORING_VERSION if backend is None else f"{SCORING_VERSION}+{backend.name}"
+
+def score_breakdown(sims, resume_keywords, jd_keywords, backend=None):
+    """Deterministic score for a (JD sentences x resume sentences) similarity matrix and both keyword sets.
+
+    Returns ``{"version", "score", "embedding", "keyword_overlap", "coverage", "avg_top_similarity",
+    "min_similarity", "unrelated"}``; equal inputs always give equal output."""
+    unrelated_min_sim, coverage_sim = _thresholds(backend)
+    top_sims = top_k(sims, TOP_N_SIMILARITIES)
+    avg_top_sim = float(np.mean(top_sims)) if top_sims.size else 0.0
+    min_sim = float(np.min(sims)) if sims.size else 0.0
+    coverage = float(np.mean(sims.max(axis=1) >= coverage_sim)) if sims.size else 0.0
+    embedding_score = float(sharp_sigmoid(avg_top_sim))
+    overlap = keyword_overlap(resume_keywords, jd_keywords)
+    unrelated = overlap < UNRELATED_OVERLAP or (unrelated_min_sim is not None and min_sim < unrelated_min_sim)
+    match_score = hybrid_score(embedding_score, overlap)
+    if unrelated:
+        # Formerly a random int in this range; now placed within it by the hybrid score
+        low, high = UNRELATED_RANGE
+        match_score = low + round((high - low) * match_score / 100)
+    return {
+        "version": scoring_version(backend),
+        "score": int(match_score),
+        "embedding": round(embedding_score, 4),
+        "keyword_overlap": round(overlap, 4),
+        "coverage": round(coverage, 4),
+        "avg_top_similarity": round(avg_top_sim, 4),
+        "min_similarity": round(min_sim, 4),
+        "unrelated": unrelated,
+    }
+
+def unrelated_reason(breakdown, backend=None):
+    """Why ``score_breakdown`` put a pair in the UNRELATED_RANGE band, or None if it did not."""
+    if not breakdown["unrelated"]:
+        return None
+    if breakdown["keyword_overlap"] < UNRELATED_OVERLAP:
+        return f"keyword overlap is below {UNRELATED_OVERLAP:.0%}"
+    return (f"the least similar pair of sentences scores {breakdown['min_similarity']:.2f}, "
+            f"below {_thresholds(backend)[0]}")
+
+def score_details(resume_text, job_description, resume_chunks, job_chunks, resume_embeds, job_embeds, backend=None):
+    """Returns (score breakdown, best resume match per JD sentence); ``backend`` is the one that made the embeddings."""
+    sims = similarity_matrix(job_embeds, resume_embeds)
+    breakdown = score_breakdown(sims, extract_keywords(resume_text), extract_keywords(job_description), backend)
+    return breakdown, best_matches(sims, job_chunks, resume_chunks)
+
+def score_match(resume_text, job_description, resume_chunks, job_chunks, resume_embeds, job_embeds, backend=None):
+    breakdown, matches = score_details(resume_text, job_description, resume_chunks, job_chunks, resume_embeds, job_embeds, backend)
+    return breakdown["score"], matches
+
+def extract_fields(text):
+    return {
+        "name": extract_name(text),
+        "email": extract_email(text),
+        "phone": extract_phone(text),
+        "skills": extract_skills(text),
+        "education": extract_education(text),
+        "experience": extract_experience(text),
+    }
+
+def embed_document(backend, text, cache=None):
+    """Sentence-split one side (resume or JD) and embed it; returns (chunks, embeddings)."""
+    chunks = split_into_sentences(text)
+    if not chunks:
+        return chunks, None
+    return chunks, embed_texts(backend, chunks, cache)
+
+def require_chunks(resume_text, job_description):
+    """Raise ValueError unless both sides have at least one sentence long enough to score."""
+    if not split_into_sentences(resume_text) or not split_into_sentences(job_description):
+        raise ValueError("Resume or job description is too short for chunked similarity analysis.")
+
+def score_documents(resume_text, job_description, resume_side, job_side, backend=None):
+    """Score from pre-embedded sides; returns (score breakdown, matches) as ``score_details``."""
+    resume_chunks, resume_embeds = resume_side
+    job_chunks, job_embeds = job_side
+    if not resume_chunks or not job_chunks:
+        raise ValueError("Resume or job description is too short for chunked similarity analysis.")
+    return score_details(resume_text, job_description, resume_chunks, job_chunks, resume_embeds, job_embeds, backend)
+
+# --- Generated feedback ---
+def build_feedback_prompt(resume_text, job_description):
+    return f"""
+You are a resume expert. Given the following resume and job description, provide:
+- Three improvement tips (as bullet points)
+- A rewritten summary/objective (2–3 sentences, plain English, no code, JSON, or HTML)
+- An ATS-friendliness checklist (5 items, each as a short sentence)
+Resume:
+{resume_text}
+Job Description:
+{job_description}
+"""
+
+FEEDBACK_MAX_TOKENS = 300
+FEEDBACK_TEMPERATURE = 0.6
+
+def generate_ai_feedback(service, resume_text, job_description):
+    ai_feedback = service.generate(
+        build_feedback_prompt(resume_text, job_description),
+        model=GENERATE_MODEL,
+        max_tokens=FEEDBACK_MAX_TOKENS,
+        temperature=FEEDBACK_TEMPERATURE
+    )
+    return clean_ai_feedback(ai_feedback)
+
+def stream_ai_feedback(service, resume_text, job_description):
+    """Start generating feedback immediately; returns a FeedbackStream yielding the cleaned feedback
+    so far each time more text arrives. The last value is the complete feedback."""
+    tokens = service.generate_stream(
+        build_feedback_prompt(resume_text, job_description),
+        model=GENERATE_MODEL,
+        max_tokens=FEEDBACK_MAX_TOKENS,
+        temperature=FEEDBACK_TEMPERATURE
+    )
+    return FeedbackStream(tokens)
+
+class FeedbackStream:
+    """Iterator over cleaned feedback; ``close()`` cancels the underlying generation,
+    which keeps running in the background until then."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self._texts = _cleaned_so_far(tokens)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._texts)
+
+    def close(self):
+        self._texts.close()
+        if hasattr(self.tokens, "close"):
+            self.tokens.close()
+
+def _cleaned_so_far(tokens):
+    feedback_filter = FeedbackFilter()
+    text = ""
+    for token in tokens:
+        text += feedback_filter.feed(token)
+        yield text.strip()
+    yield (text + feedback_filter.flush()).strip()
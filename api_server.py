@@ -0,0 +1,337 @@
+"""Headless JSON API over the analysis pipeline, for programmatic (e.g. ATS) traffic.
+
+    python api_server.py --backend local --port 8080
+    curl -s localhost:8080/v1/score -d '{"resume_text": "...", "job_description": "..."}'
+
+Endpoints (POST, JSON bodies):
+
+- ``/v1/extract``: ``{"resume": {"filename", "content_base64"}}`` or ``{"resume_text"}`` -> text and fields
+- ``/v1/score``: resume plus ``job_description`` -> score breakdown, best matches and fields
+- ``/v1/feedback``: resume plus ``job_description`` -> generated feedback (needs Cohere)
+- ``/v1/analyze``: score and feedback together
+
+``GET /metrics`` reports per-endpoint latency percentiles, throughput, queue
+depth and coalescing/rejection counters; ``GET /healthz`` is a liveness check.
+
+Identical requests that arrive while one is already being computed wait for
+that computation instead of starting their own. New computations go to a
+fixed pool of workers through a bounded queue; when it is full the server
+answers 503 with Retry-After rather than queueing without limit.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import analysis
+from profiling import StageTimer
+
+DEFAULT_API_WORKERS = int(os.environ.get("RESUME_API_WORKERS", "4"))
+DEFAULT_MAX_PENDING = int(os.environ.get("RESUME_API_MAX_PENDING", "64"))
+MAX_BODY_BYTES = 10 * 2**20
+RETRY_AFTER_SECONDS = 1
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringService:
+    """Runs pipeline operations on a bounded worker pool, coalescing identical in-flight requests."""
+
+    def __init__(self, backend, cohere_service=None, cache=None, ingestor=None,
+                 workers=DEFAULT_API_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self.backend = backend
+        self.cohere_service = cohere_service
+        self.cache = cache
+        self.ingestor = ingestor
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="api-worker")
+        self._in_flight = {}  # request key -> Future shared by every identical caller
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = StageTimer()  # per endpoint, end-to-end
+        self.compute = StageTimer()  # per operation, work actually done
+        self.counters = {"requests": 0, "computed": 0, "coalesced": 0, "rejected": 0, "errors": 0}
+        self._pending = 0  # queued + running computations
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def submit(self, op, payload):
+        """Run ``op`` on ``payload`` and return its result, sharing the work with identical concurrent calls."""
+        key = (op, hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest())
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.counters["coalesced"] += 1
+            else:
+                if self._pending >= self.max_pending:
+                    self.counters["rejected"] += 1
+                    raise QueueFull(f"{self._pending} requests pending")
+                self._pending += 1
+                future = Future()
+                self._in_flight[key] = future
+                self._executor.submit(self._run, key, future, op, payload)
+        return future.result()
+
+    def _run(self, key, future, op, payload):
+        try:
+            with self.compute.stage(op):
+                result = getattr(self, op)(payload)
+            self.count("computed")
+            future.set_result(result)
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                self._pending -= 1
+
+    # --- Operations ---
+    def _resume_text(self, payload):
+        if "resume_text" in payload:
+            if not isinstance(payload["resume_text"], str):
+                raise ApiError(400, '"resume_text" must be a string.')
+            return payload["resume_text"]
+        resume = payload.get("resume")
+        if not isinstance(resume, dict) or "filename" not in resume or "content_base64" not in resume:
+            raise ApiError(400, 'Provide "resume_text" or "resume": {"filename", "content_base64"}.')
+        if not isinstance(resume["filename"], str) or not isinstance(resume["content_base64"], str):
+            raise ApiError(400, "resume.filename and resume.content_base64 must be strings.")
+        try:
+            data = base64.b64decode(resume["content_base64"], validate=True)
+        except ValueError:
+            raise ApiError(400, "resume.content_base64 is not valid base64.")
+        try:
+            if self.ingestor is not None:
+                return self.ingestor.extract(resume["filename"], data)
+            from ingest import extract_text
+            return extract_text(resume["filename"], data)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        except Exception as e:
+            raise ApiError(422, f"Could not extract text: {e}")
+
+    @staticmethod
+    def _job_description(payload):
+        job_description = payload.get("job_description")
+        if not isinstance(job_description, str) or not job_description.strip():
+            raise ApiError(400, 'Provide a non-empty "job_description".')
+        return job_description
+
+    def extract(self, payload):
+        text = self._resume_text(payload)
+        return {"text": text, "fields": analysis.extract_fields(text)}
+
+    def score(self, payload):
+        return self._score(self._resume_text(payload), self._job_description(payload))
+
+    def _score(self, text, job_description):
+        try:
+            breakdown, matches = analysis.score_documents(
+                text, job_description,
+                analysis.embed_document(self.backend, text, self.cache),
+                analysis.embed_document(self.backend, job_description, self.cache),
+                self.backend,
+            )
+        except ValueError as e:
+            raise ApiError(422, str(e))
+        return {"score": breakdown, "matches": matches, "fields": analysis.extract_fields(text)}
+
+    def _require_feedback(self):
+        if self.cohere_service is None:
+            raise ApiError(501, "Feedback generation needs a Cohere API key (or --base-url).")
+
+    def feedback(self, payload):
+        self._require_feedback()
+        text = self._resume_text(payload)
+        return {"feedback": analysis.generate_ai_feedback(self.cohere_service, text, self._job_description(payload))}
+
+    def analyze(self, payload):
+        self._require_feedback()
+        text = self._resume_text(payload)
+        job_description = self._job_description(payload)
+        try:
+            analysis.require_chunks(text, job_description)
+        except ValueError as e:
+            raise ApiError(422, str(e))
+        # Generation runs on the Cohere service's loop while this thread embeds and scores
+        stream = analysis.stream_ai_feedback(self.cohere_service, text, job_description)
+        try:
+            result = self._score(text, job_description)
+            feedback = ""
+            for feedback in stream:
+                pass
+        finally:
+            stream.close()
+        result["feedback"] = feedback
+        return result
+
+    def metrics(self):
+        uptime = time.monotonic() - self.started
+        with self._lock:
+            counters = dict(self.counters)
+            pending, in_flight = self._pending, len(self._in_flight)
+        return {
+            "uptime_s": round(uptime, 1),
+            "requests_per_s": round(counters["requests"] / uptime, 2) if uptime else 0,
+            **counters,
+            "pending": pending,
+            "in_flight_keys": in_flight,
+            "max_pending": self.max_pending,
+            "endpoints": self.requests.summary(),
+            "operations": self.compute.summary(),
+            "embedding_cache": self.cache.stats() if self.cache is not None else None,
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+OPERATIONS = {"/v1/extract": "extract", "/v1/score": "score", "/v1/feedback": "feedback", "/v1/analyze": "analyze"}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "ResumeAnalyzerAPI/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive for ATS clients and load tests
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send_json(200, self.server.service.metrics())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        service = self.server.service
+        op = OPERATIONS.get(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            # The body cannot be delimited, so the connection cannot be reused
+            self.close_connection = True
+            self._send_json(400, {"error": "Invalid Content-Length header."})
+            return
+        if length > MAX_BODY_BYTES:
+            # Checked before routing so no path makes the server read an oversized body
+            self.close_connection = True
+            self._send_json(413, {"error": f"Request body over {MAX_BODY_BYTES} bytes."})
+            return
+        if op is None:
+            self.rfile.read(length)
+            self._send_json(404, {"error": "not found"})
+            return
+        service.count("requests")
+        with service.requests.stage(self.path):
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(payload, dict):
+                    raise ApiError(400, "Request body must be a JSON object.")
+                self._send_json(200, service.submit(op, payload))
+            except QueueFull as e:
+                self._send_json(503, {"error": f"Server busy: {e}"}, {"Retry-After": str(RETRY_AFTER_SECONDS)})
+            except json.JSONDecodeError as e:
+                self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            except RecursionError:
+                self._send_json(400, {"error": "Request body is nested too deeply."})
+            except ApiError as e:
+                self._send_json(e.status, {"error": str(e)})
+            except Exception as e:
+                service.count("errors")
+                self._send_json(500, {"error": str(e)})
+
+
+class ApiHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # listen backlog; the default of 5 drops connections under bursts
+
+
+def start_api_server(service, host="127.0.0.1", port=0, verbose=False):
+    """Serve ``service`` on a background thread; returns (server, base_url)."""
+    server = ApiHTTPServer((host, port), ApiHandler)
+    server.service = service
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, name="resume-api", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None):
+    from batch_screen import load_api_key
+    from cohere_service import CohereService
+    from embedding_backends import get_backend, BACKENDS, DEFAULT_BACKEND
+    from embedding_cache import EmbeddingCache
+    from ingest import DocumentIngestor, DEFAULT_WORKERS
+
+    parser = argparse.ArgumentParser(description="Serve resume extraction, scoring and feedback as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND, help="embedding backend; 'local' runs offline without an API key")
+    parser.add_argument("--base-url", default=os.environ.get("COHERE_BASE_URL"), help="Cohere API base URL (e.g. a local fake_cohere.py)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_API_WORKERS, help="concurrent computations")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="queued + running computations before answering 503")
+    parser.add_argument("--ingest-workers", type=int, default=DEFAULT_WORKERS, help="processes for PDF/DOCX extraction")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk embedding cache")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    api_key = load_api_key()
+    if args.backend == "cohere" and not api_key and not args.base_url:
+        parser.error("Set COHERE_API_KEY or add it to .streamlit/secrets.toml, or use --backend local")
+    cohere_service = CohereService(api_key or "local", base_url=args.base_url) if api_key or args.base_url else None
+    service = ScoringService(
+        get_backend(args.backend, cohere_service),
+        cohere_service=cohere_service,
+        cache=None if args.no_cache else EmbeddingCache(),
+        ingestor=DocumentIngestor(max_workers=args.ingest_workers),
+        workers=args.workers,
+        max_pending=args.max_pending,
+    )
+    server, url = start_api_server(service, args.host, args.port, args.verbose)
+    print(f"Resume analysis API listening on {url}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        service.close()
+        service.ingestor.close()
+        if service.cache is not None:
+            service.cache.close()
+        if cohere_service is not None:
+            cohere_service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,138 +1,162 @@
 import streamlit as st
-import pdfplumber
-import docx2txt
-import tempfile
-import re
-import cohere
-import numpy as np
-import matplotlib.pyplot as plt
-
-# --- Helper functions for info extraction and analysis ---
-def extract_email(text):
-    match = re.search(r"[\w\.-]+@[\w\.-]+", text)
-    return match.group(0) if match else None
-
-def extract_phone(text):
-    match = re.search(r"(\+?\d{1,3}[\s-]?)?(\(?\d{3}\)?[\s-]?)?\d{3}[\s-]?\d{4}", text)
-    return match.group(0) if match else None
-
-def extract_name(text):
-    lines = text.splitlines()
-    for line in lines[:5]:
-        if len(line.split()) in [2, 3] and all(w[0].isupper() for w in line.split() if w):
-            return line.strip()
-    return lines[0].strip() if lines else None
-
-def extract_skills(text):
-    skills = []
-    skill_section = re.search(r"Skills[\s\n:]*([\s\S]{0,300})", text, re.IGNORECASE)
-    if skill_section:
-        possible = skill_section.group(1)
-        skills = re.findall(r"\b[A-Za-z\+\#]{2,}\b", possible)
-    return list(set(skills))[:15]
-
-def extract_education(text):
-    edu_section = re.search(r"Education[\s\n:]*([\s\S]{0,400})", text, re.IGNORECASE)
-    if edu_section:
-        return edu_section.group(1).strip().split('\n')[0:3]
-    return []
-
-def extract_experience(text):
-    exp_section = re.search(r"Experience[\s\n:]*([\s\S]{0,600})", text, re.IGNORECASE)
-    if exp_section:
-        return exp_section.group(1).strip().split('\n')[0:5]
-    return []
-
-def split_into_sentences(text):
-    return [s.strip() for s in re.split(r'[\n\.!?]', text) if len(s.strip()) > 20]
-
-def extract_keywords(text):
-    skills = set(extract_skills(text))
-    skills.update(w for w in re.findall(r'\b[A-Z][a-zA-Z0-9\+#]*\b', text) if len(w) > 2)
-    tech_terms = ["Python", "Java", "C++", "SQL", "JavaScript", "React", "Django", "Flask", "AWS", "Git", "Linux", "Agile", "Scrum", "HTML", "CSS", "Node", "TypeScript", "Machine Learning", "Data Science"]
-    for term in tech_terms:
-        if term.lower() in text.lower():
-            skills.add(term)
-    return set(map(str.lower, skills))
-
-def clean_ai_feedback(text):
-    import re
-    text = re.sub(r'```[\s\S]*?```', '', text)
-    text = re.sub(r'\{[\s\S]*?\}', '', text)
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'</?div>', '', text, flags=re.IGNORECASE)
-    return text.strip()
-
-def cohere_analyze(resume_text, job_description):
-    api_key = st.secrets["COHERE_API_KEY"]
-    co = cohere.Client(api_key)
-    resume_chunks = split_into_sentences(resume_text)
-    job_chunks = split_into_sentences(job_description)
-    if not resume_chunks or not job_chunks:
-        raise ValueError("Resume or job description is too short for chunked similarity analysis.")
-    all_chunks = resume_chunks + job_chunks
+import io
+from collections import OrderedDict
+from contextlib import contextmanager
+from charts import score_gauge_svg
+from profiling import StageTimer
+from embedding_cache import EmbeddingCache
+from analysis import extract_keywords, text_hash
+from ingest import DocumentIngestor, SUPPORTED_EXTENSIONS
+from cohere_service import CohereService
+from embedding_backends import get_backend, DEFAULT_BACKEND
+from batch_screen import screen_resumes, iter_uploaded_documents, write_csv, write_json, RESULT_FIELDS
+import analysis
+
+@st.cache_resource
+def get_embedding_cache():
+    # One on-disk cache per server process, shared by every session
+    return EmbeddingCache()
+
+@st.cache_resource
+def get_ingestor():
+    # Process pool and parsed-text cache shared by every session
+    return DocumentIngestor()
+
+@st.cache_resource
+def get_cohere_service():
+    # One pooled async client per process; COHERE_BASE_URL can point at fake_cohere.py for offline use
+    return CohereService(st.secrets["COHERE_API_KEY"], base_url=st.secrets.get("COHERE_BASE_URL"))
+
+@st.cache_resource
+def get_embedding_backend():
+    # "cohere" (default) or "local" for offline scoring with no API calls
+    name = st.secrets.get("EMBEDDING_BACKEND", DEFAULT_BACKEND)
+    return get_backend(name, get_cohere_service() if name == "cohere" else None)
+
+# --- Memoized pipeline stages, shared across reruns and sessions ---
+# Each stage is keyed on the hash of its own input only (the underscore-prefixed text arguments are
+# skipped by Streamlit's hasher), so editing the JD re-runs just the JD side and the final score.
+# Within a side, the embedding cache means only new or changed sentences are sent to Cohere.
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_fields(doc_hash, _text):
+    return analysis.extract_fields(_text)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_document_embeddings(backend_name, doc_hash, _text):
+    return analysis.embed_document(get_embedding_backend(), _text, get_embedding_cache())
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_match_score(backend_name, scoring_version, resume_hash, jd_hash, _resume_text, _job_description):
+    return analysis.score_documents(
+        _resume_text, _job_description,
+        cached_document_embeddings(backend_name, resume_hash, _resume_text),
+        cached_document_embeddings(backend_name, jd_hash, _job_description),
+        get_embedding_backend(),
+    )
+
+def cached_match_score(resume_hash, jd_hash, resume_text, job_description):
+    """Returns (score breakdown, matches); scoring is deterministic, so this is safe to memoize."""
+    return _cached_match_score(get_embedding_backend().name, analysis.SCORING_VERSION, resume_hash, jd_hash, resume_text, job_description)
+
+FEEDBACK_STORE_SIZE = 512
+
+@st.cache_resource
+def get_feedback_store():
+    # Finished AI feedback keyed on (resume hash, JD hash), shared across reruns and sessions
+    return OrderedDict()
+
+def remember_feedback(keys, ai_feedback):
+    store = get_feedback_store()
+    store[keys] = ai_feedback
+    while len(store) > FEEDBACK_STORE_SIZE:
+        store.popitem(last=False)
+
+def analyze(resume_text, job_description):
+    """Score the resume and start streaming feedback. Returns (result, feedback_stream); the stream
+    is None when the feedback for these inputs is already known."""
+    keys = (text_hash(resume_text), text_hash(job_description))
+    ai_feedback = get_feedback_store().get(keys)
+    feedback_stream = None
+    if ai_feedback is None:
+        # Generation starts before scoring, so tokens are already arriving when the score is shown.
+        # Inputs that cannot be scored are rejected first so no generation is started for them.
+        analysis.require_chunks(resume_text, job_description)
+        try:
+            feedback_stream = analysis.stream_ai_feedback(get_cohere_service(), resume_text, job_description)
+        except Exception:
+            pass  # e.g. no API key with the local backend; reported where the feedback is shown
     try:
-        embeds = co.embed(
-            texts=all_chunks,
-            model="embed-english-v3.0",
-            embedding_types=["float"],
-            input_type="search_document"
-        )
-    except Exception as e:
-        raise RuntimeError(f"Cohere embed API call failed: {e}")
-    if isinstance(embeds.embeddings, list):
-        float_embeds = embeds.embeddings
-    elif hasattr(embeds.embeddings, "float_"):
-        float_embeds = embeds.embeddings.float_
-    else:
-        raise ValueError("Cohere did not return valid float embeddings. Please check your API key, input text, and Cohere API status.")
-    if not isinstance(float_embeds, list) or len(float_embeds) < 2:
-        raise ValueError("Cohere returned empty or malformed float embeddings. Please check your input text.")
-    resume_embeds = float_embeds[:len(resume_chunks)]
-    job_embeds = float_embeds[len(resume_chunks):]
-    all_sims = []
-    for jvec in job_embeds:
-        for rvec in resume_embeds:
-            sim = np.dot(jvec, rvec) / (np.linalg.norm(jvec) * np.linalg.norm(rvec))
-            all_sims.append(sim)
-    top_n = 5
-    top_sims = sorted(all_sims, reverse=True)[:top_n]
-    avg_top_sim = np.mean(top_sims) if top_sims else 0
-    min_sim = np.min(all_sims) if all_sims else 0
-    def sharp_sigmoid(x):
-        return 1 / (1 + np.exp(-x * 10 + 2))  # sharper and shifted
-    embedding_score = sharp_sigmoid(avg_top_sim)
-    resume_keywords = extract_keywords(resume_text)
-    jd_keywords = extract_keywords(job_description)
-    if jd_keywords:
-        overlap = len(resume_keywords & jd_keywords) / len(jd_keywords)
-    else:
-        overlap = 0
-    # --- Hybrid scoring logic with random low range for unrelated ---
-    if overlap < 0.1 or min_sim < 0.05:
-        match_score = int(np.random.randint(35, 46))  # Random int between 35 and 45 inclusive
+        breakdown, matches = cached_match_score(*keys, resume_text, job_description)
+    except Exception:
+        if feedback_stream is not None:
+            feedback_stream.close()  # the feedback would never be shown
+        raise
+    result = {
+        "keys": keys,
+        "match_score": breakdown["score"],
+        "score_breakdown": breakdown,
+        "matches": matches,
+        "ai_feedback": ai_feedback,
+    }
+    return result, feedback_stream
+
+# --- Memoized report sections ---
+# Built once per (resume, JD) pair and shared across reruns and sessions; a rerun only re-sends the markup.
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_score_report(backend_name, scoring_version, resume_hash, jd_hash, _resume_text, _job_description):
+    breakdown, matches = _cached_match_score(backend_name, scoring_version, resume_hash, jd_hash, _resume_text, _job_description)
+    best = sorted(matches, key=lambda m: m["similarity"], reverse=True)[:5]
+    return {
+        "score": f'<div class="score-box">Score: <b>{breakdown["score"]}/100</b></div>',
+        "breakdown": (f"- Semantic similarity: {breakdown['embedding']:.0%}\n"
+                      f"- Keyword overlap: {breakdown['keyword_overlap']:.0%}\n"
+                      f"- Job requirements covered: {breakdown['coverage']:.0%} (informational, not part of the score)"),
+        "unrelated": (f"Scored as unrelated, which caps the score at {analysis.UNRELATED_RANGE[0]}–"
+                      f"{analysis.UNRELATED_RANGE[1]}: {analysis.unrelated_reason(breakdown, get_embedding_backend())}."
+                      if breakdown["unrelated"] else None),
+        "version": f"Scoring v{breakdown['version']}",
+        "job_match": f'<div class="score-box">Job Match: <b>{breakdown["score"]}%</b></div>',
+        "best_matches": "\n".join(
+            f"- <span style='color:#a5b4fc;'>{m['job_sentence']}</span> → {m['resume_sentence']} ({m['similarity']:.2f})"
+            for m in best
+        ),
+    }
+
+def score_report(resume_text, job_description):
+    return _cached_score_report(get_embedding_backend().name, analysis.SCORING_VERSION,
+                                text_hash(resume_text), text_hash(job_description), resume_text, job_description)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_keyword_report(resume_hash, jd_hash, _resume_text, _job_description):
+    resume_keywords = extract_keywords(_resume_text)
+    jd_keywords = extract_keywords(_job_description)
+    present = sorted(resume_keywords & jd_keywords)
+    missing = sorted(jd_keywords - resume_keywords)
+    return (f"- <span style='color:#38bdf8;'>Present:</span> <span>{', '.join(present) if present else 'None'}</span>\n"
+            f"- <span style='color:#f87171;'>Missing:</span> <span>{', '.join(missing) if missing else 'None'}</span>")
+
+def keyword_report(resume_text, job_description):
+    return _cached_keyword_report(text_hash(resume_text), text_hash(job_description), resume_text, job_description)
+
+def get_stage_timer():
+    # Per-session stage latencies for the optional timing panel
+    if 'stage_timer' not in st.session_state:
+        st.session_state['stage_timer'] = StageTimer()
+    return st.session_state['stage_timer']
+
+@contextmanager
+def timed(stage):
+    with get_stage_timer().stage(stage):
+        yield
+    if show_timings:
+        render_timings()
+
+def render_timings():
+    summary = get_stage_timer().summary()
+    if summary:
+        timing_panel.dataframe([{"stage": name, **row} for name, row in summary.items()], use_container_width=True)
     else:
-        combined_score = 0.6 * embedding_score + 0.4 * overlap
-        match_score = int(np.clip(combined_score * 100, 0, 100))
-    prompt = f"""
-You are a resume expert. Given the following resume and job description, provide:
-- Three improvement tips (as bullet points)
-- A rewritten summary/objective (2–3 sentences, plain English, no code, JSON, or HTML)
-- An ATS-friendliness checklist (5 items, each as a short sentence)
-Resume:
-{resume_text}
-Job Description:
-{job_description}
-"""
-    response = co.generate(
-        model="command",
-        prompt=prompt,
-        max_tokens=300,
-        temperature=0.6
-    )
-    ai_feedback = response.generations[0].text
-    ai_feedback = clean_ai_feedback(ai_feedback)
-    return match_score, ai_feedback
+        timing_panel.caption("No stages timed yet. Run an analysis.")
 
 # --- Custom CSS for dark theme and animations ---
 st.markdown('''
@@ -194,6 +218,14 @@ st.sidebar.markdown("<span style='color:#38bdf8;font-size:1.5rem;font-weight:700
 st.sidebar.markdown("<span style='color:#a5b4fc;'>AI-powered resume feedback and job matching.</span>", unsafe_allow_html=True)
 st.sidebar.markdown("---")
 st.sidebar.info("Upload your resume and paste a job description to get instant, AI-driven feedback and a match score.")
+cache_stats = get_embedding_cache().stats()
+st.sidebar.caption(f"Embedding cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)")
+show_timings = st.sidebar.checkbox("Show stage timings", value=False, help="Latency per pipeline stage for this session")
+timing_panel = st.sidebar.empty()
+if show_timings:
+    if st.sidebar.button("Reset timings"):
+        get_stage_timer().reset()
+    render_timings()
 
 st.markdown('<div class="big-title">Resume Analyzer</div>', unsafe_allow_html=True)
 st.markdown('<div class="subtitle">Upload your resume and compare it to a job description. Get instant feedback, a match score, and improvement tips!</div>', unsafe_allow_html=True)
@@ -202,7 +234,7 @@ st.markdown('<div class="subtitle">Upload your resume and compare it to a job de
 col1, col2 = st.columns(2)
 with col1:
     st.markdown('<div class="section-header">1. Upload Your Resume</div>', unsafe_allow_html=True)
-    resume_file = st.file_uploader("Choose your resume file (PDF, DOCX, or TXT)", type=["pdf", "docx", "txt"])
+    resume_file = st.file_uploader("Choose your resume file (PDF, DOCX, or TXT)", type=list(SUPPORTED_EXTENSIONS))
 with col2:
     st.markdown('<div class="section-header">2. Paste Job Description (Optional)</div>', unsafe_allow_html=True)
     job_description = st.text_area("Paste the job description here (optional)", height=180)
@@ -236,33 +268,25 @@ resume_text = None
 if st.session_state['analysis_done'] and st.session_state['last_resume']:
     resume_file = st.session_state['last_resume']
     job_description = st.session_state['last_jd']
-    filetype = resume_file.name.split(".")[-1].lower()
-    if filetype == "pdf":
-        with pdfplumber.open(resume_file) as pdf:
-            resume_text = "\n".join(page.extract_text() or '' for page in pdf.pages)
-    elif filetype == "docx":
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as tmp:
-            tmp.write(resume_file.read())
-            tmp_path = tmp.name
-        resume_text = docx2txt.process(tmp_path)
-    elif filetype == "txt":
-        resume_text = resume_file.read().decode("utf-8")
-    else:
+    try:
+        with timed("extract_text"):
+            resume_text = get_ingestor().extract(resume_file.name, resume_file.getvalue())
+    except ValueError:
         st.error("Unsupported file type.")
 
     if resume_text:
         st.success(f"Uploaded: {resume_file.name}")
         st.markdown('<div class="section-header">Extracted Resume Text</div>', unsafe_allow_html=True)
-        st.text_area("Resume Content", resume_text, height=200)
+        # Off by default: the full text would otherwise be re-sent to the browser on every rerun
+        if st.toggle("Show extracted resume text", key="show_resume_text"):
+            st.text_area("Resume Content", resume_text, height=200)
 
         st.markdown('<div class="section-header">Extracted Information</div>', unsafe_allow_html=True)
         info_cols = st.columns(3)
-        name = extract_name(resume_text)
-        email = extract_email(resume_text)
-        phone = extract_phone(resume_text)
-        skills = extract_skills(resume_text)
-        education = extract_education(resume_text)
-        experience = extract_experience(resume_text)
+        with timed("extract_fields"):
+            fields = cached_fields(text_hash(resume_text), resume_text)
+        name, email, phone = fields["name"], fields["email"], fields["phone"]
+        skills, education, experience = fields["skills"], fields["education"], fields["experience"]
         with info_cols[0]:
             st.markdown(f"**Name:**<br>{name if name else 'Not found'}", unsafe_allow_html=True)
             st.markdown(f"**Email:**<br>{email if email else 'Not found'}", unsafe_allow_html=True)
@@ -274,57 +298,50 @@ if st.session_state['analysis_done'] and st.session_state['last_resume']:
             st.markdown(f"**Experience:**<br>{'; '.join(experience) if experience else 'Not found'}", unsafe_allow_html=True)
 
         # --- Cohere Analysis ---
+        feedback_stream = None
         if st.session_state['analysis_result'] is None:
             st.markdown('<div class="section-header">AI Analysis & Feedback</div>', unsafe_allow_html=True)
-            import time
-            progress = st.progress(0)
-            for percent in range(0, 101, 10):
-                time.sleep(0.04)
-                progress.progress(percent)
-            with st.spinner("Analyzing with Cohere..."):
+            with st.spinner("Scoring with Cohere..."):
                 try:
-                    match_score, ai_feedback = cohere_analyze(resume_text, job_description)
-                    progress.progress(100)
-                    st.session_state['analysis_result'] = (match_score, ai_feedback)
+                    with timed("score"):
+                        st.session_state['analysis_result'], feedback_stream = analyze(resume_text, job_description)
                 except Exception as e:
                     st.error(f"Cohere analysis failed: {e}")
                     st.session_state['analysis_result'] = None
         if st.session_state['analysis_result']:
-            match_score, ai_feedback = st.session_state['analysis_result']
+            result = st.session_state['analysis_result']
+            match_score = result['match_score']
             st.markdown(f'<div class="score-box">Match Score: <b>{match_score}/100</b></div>', unsafe_allow_html=True)
-            # --- Line graph (gauge-style) for score ---
-            fig, ax = plt.subplots(figsize=(6, 1.2))
-            fig.patch.set_facecolor('#111827')  # Set figure background to dark
-            ax.set_facecolor('#111827')         # Set axes background to dark
-            # Draw colored segments
-            ax.axhline(0, xmin=0, xmax=0.5, color='#ef4444', linewidth=10)  # Red for <50
-            ax.axhline(0, xmin=0.5, xmax=0.8, color='#facc15', linewidth=10)  # Yellow for 50-79
-            ax.axhline(0, xmin=0.8, xmax=1, color='#22c55e', linewidth=10)  # Green for 80+
-            # Draw arrow/marker for score
-            score_pos = match_score / 100
-            ax.plot([score_pos], [0], marker='v', markersize=18, color='#2563eb')
-            # Remove axes
-            ax.set_yticks([])
-            ax.set_xticks([0, 0.5, 0.8, 1])
-            ax.set_xticklabels(['0', '50', '80', '100'], color='#f3f4f6')  # Light text for dark bg
-            ax.set_xlim(0, 1)
-            ax.set_frame_on(False)
-            for spine in ax.spines.values():
-                spine.set_visible(False)
-            st.pyplot(fig)
+            # --- Gauge for score (inline SVG, built once per score value) ---
+            with timed("gauge_render"):
+                st.markdown(score_gauge_svg(match_score), unsafe_allow_html=True)
             st.markdown('<div style="display:flex;gap:2rem;margin-bottom:1rem;">'
                         '<span style="color:#ef4444;font-weight:bold;">Red: Not a fit (&lt;50)</span>'
                         '<span style="color:#facc15;font-weight:bold;">Yellow: Slightly fit (50-79)</span>'
                         '<span style="color:#22c55e;font-weight:bold;">Green: Good fit (80+)</span>'
                         '</div>', unsafe_allow_html=True)
             st.markdown("---")
-            st.markdown(f'<div class="info-box">{ai_feedback}</div>', unsafe_allow_html=True)
+            if result['ai_feedback'] is None:
+                # Stream the feedback in as it is generated
+                feedback_box = st.empty()
+                try:
+                    with timed("generate"):
+                        if feedback_stream is None:
+                            feedback_stream = analysis.stream_ai_feedback(get_cohere_service(), resume_text, job_description)
+                        for ai_feedback in feedback_stream:
+                            feedback_box.markdown(f'<div class="info-box">{ai_feedback}</div>', unsafe_allow_html=True)
+                    result['ai_feedback'] = ai_feedback
+                    remember_feedback(result['keys'], ai_feedback)
+                except Exception as e:
+                    st.error(f"Cohere feedback generation failed: {e}")
+            else:
+                st.markdown(f'<div class="info-box">{result["ai_feedback"]}</div>', unsafe_allow_html=True)
     else:
         st.warning("Could not extract text from the uploaded file.")
 
 # --- Privacy Notice ---
 st.markdown('<div style="background:#0f172a;padding:0.7rem 1rem;border-radius:8px;color:#38bdf8;font-size:1rem;margin-bottom:1rem;">\
-<b>Privacy Notice:</b> Your resume is processed in-memory only. No files are stored or shared.</div>', unsafe_allow_html=True)
+<b>Privacy Notice:</b> Your resume is processed in memory and never saved to disk. Only sentence hashes and their embeddings are cached to speed up repeat analyses.</div>', unsafe_allow_html=True)
 
 # --- Main Analysis Sections ---
 if st.session_state['analysis_done'] and resume_text:
@@ -339,8 +356,12 @@ if st.session_state['analysis_done'] and resume_text:
         """)
         if job_description:
             try:
-                match_score, _ = cohere_analyze(resume_text, job_description)
-                st.markdown(f'<div class="score-box">Score: <b>{match_score}/100</b></div>', unsafe_allow_html=True)
+                report = score_report(resume_text, job_description)
+                st.markdown(report["score"], unsafe_allow_html=True)
+                st.markdown(report["breakdown"])
+                if report["unrelated"]:
+                    st.warning(report["unrelated"])
+                st.caption(report["version"])
             except:
                 st.info("Score will appear after analysis.")
         else:
@@ -351,12 +372,7 @@ if st.session_state['analysis_done'] and resume_text:
         st.markdown("""
         <span style='color:#a5b4fc;'>Highlights skills or terms present and missing compared to the job description.</span>
         """, unsafe_allow_html=True)
-        resume_keywords = extract_keywords(resume_text)
-        jd_keywords = extract_keywords(job_description)
-        present = sorted(resume_keywords & jd_keywords)
-        missing = sorted(jd_keywords - resume_keywords)
-        st.markdown(f"- <span style='color:#38bdf8;'>Present:</span> <span>{', '.join(present) if present else 'None'}</span>", unsafe_allow_html=True)
-        st.markdown(f"- <span style='color:#f87171;'>Missing:</span> <span>{', '.join(missing) if missing else 'None'}</span>", unsafe_allow_html=True)
+        st.markdown(keyword_report(resume_text, job_description), unsafe_allow_html=True)
 
     # --- ATS Compatibility Check ---
     with st.expander("ATS Compatibility Check", expanded=True):
@@ -390,8 +406,10 @@ if st.session_state['analysis_done'] and resume_text:
         st.markdown("Calculates how well your resume fits a specific job description.")
         if job_description:
             try:
-                match_score, _ = cohere_analyze(resume_text, job_description)
-                st.markdown(f'<div class="score-box">Job Match: <b>{match_score}%</b></div>', unsafe_allow_html=True)
+                report = score_report(resume_text, job_description)
+                st.markdown(report["job_match"], unsafe_allow_html=True)
+                st.markdown("**Best resume match for each job requirement:**")
+                st.markdown(report["best_matches"], unsafe_allow_html=True)
             except:
                 st.info("Job match will appear after analysis.")
         else:
@@ -431,4 +449,32 @@ if st.session_state['analysis_done'] and resume_text:
     # --- Job Description Parser ---
     with st.expander("Job Description Parser", expanded=True):
         st.markdown("Automatically extracts required skills and keywords from JD.")
-        st.markdown("- <span style='color:#38bdf8;'>Extracted: Python, SQL, Communication</span>", unsafe_allow_html=True) 
\ No newline at end of file
+        st.markdown("- <span style='color:#38bdf8;'>Extracted: Python, SQL, Communication</span>", unsafe_allow_html=True) 
+# --- Batch Screening: rank many resumes against the job description ---
+st.markdown('<div class="section-header">Batch Screening</div>', unsafe_allow_html=True)
+with st.expander("Rank multiple resumes against this job description", expanded=False):
+    batch_files = st.file_uploader(
+        "Upload resumes (PDF, DOCX, TXT) or zip archives of resumes",
+        type=list(SUPPORTED_EXTENSIONS) + ["zip"],
+        accept_multiple_files=True,
+        key="batch_files",
+    )
+    if st.button("Rank Resumes", disabled=not (batch_files and job_description)):
+        with st.spinner("Scoring resumes..."):
+            try:
+                st.session_state['batch_rows'] = screen_resumes(
+                    get_embedding_backend(), iter_uploaded_documents(batch_files), job_description,
+                    get_embedding_cache(), get_ingestor(),
+                )
+            except Exception as e:
+                st.error(f"Batch screening failed: {e}")
+    if not job_description:
+        st.info("Paste a job description above to rank resumes.")
+    if st.session_state.get('batch_rows'):
+        batch_rows = st.session_state['batch_rows']
+        st.dataframe([{k: row.get(k) for k in RESULT_FIELDS} for row in batch_rows], use_container_width=True)
+        csv_out, json_out = io.StringIO(), io.StringIO()
+        write_csv(batch_rows, csv_out)
+        write_json(batch_rows, json_out)
+        st.download_button("Download CSV", csv_out.getvalue(), file_name="ranked_resumes.csv", mime="text/csv")
+        st.download_button("Download JSON", json_out.getvalue(), file_name="ranked_resumes.json", mime="application/json")
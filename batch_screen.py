@@ -0,0 +1,180 @@
+"""Rank many resumes against one job description.
+
+    python batch_screen.py --jd job.txt resumes/ more_resumes.zip --out ranked.csv
+
+Inputs can be directories, zip archives or individual PDF/DOCX/TXT files.
+The job description is embedded once and all resume sentences are packed into
+full-size co.embed batches, sent concurrently. Output is CSV or JSON, chosen
+by the --out extension.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import zipfile
+
+import numpy as np
+
+from analysis import (
+    extract_name, extract_email, extract_skills, split_into_sentences, embed_texts, score_details,
+)
+from embedding_backends import get_backend, BACKENDS, DEFAULT_BACKEND
+from ingest import extract_text, file_extension, DocumentIngestor, DEFAULT_WORKERS, SUPPORTED_EXTENSIONS
+
+BREAKDOWN_FIELDS = ["embedding", "keyword_overlap", "coverage", "scoring_version"]
+RESULT_FIELDS = ["rank", "file", "score", *BREAKDOWN_FIELDS, "name", "email", "skills", "error"]
+
+
+def _zip_members(zf, archive):
+    """Yield (name, bytes) for supported files in an open zip; names are prefixed with
+    the archive's so that "resume.pdf" in two archives stays two documents."""
+    for info in zf.infolist():
+        if not info.is_dir() and file_extension(info.filename) in SUPPORTED_EXTENSIONS:
+            yield f"{archive}/{info.filename}", zf.read(info)
+
+
+def iter_documents(paths):
+    """Yield (name, bytes) for every supported file in the given files, directories and
+    zip archives. Zip members are named "<archive path>/<member>", e.g. "a.zip/resume.pdf"."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for fname in sorted(files):
+                    yield from iter_documents([os.path.join(root, fname)])
+        elif file_extension(path) == "zip":
+            with zipfile.ZipFile(path) as zf:
+                yield from _zip_members(zf, path)
+        elif file_extension(path) in SUPPORTED_EXTENSIONS:
+            with open(path, "rb") as f:
+                yield path, f.read()
+
+
+def iter_uploaded_documents(uploaded_files):
+    """Same as iter_documents, for Streamlit UploadedFile objects (zip uploads are expanded)."""
+    for uploaded in uploaded_files:
+        if file_extension(uploaded.name) == "zip":
+            with zipfile.ZipFile(io.BytesIO(uploaded.getvalue())) as zf:
+                yield from _zip_members(zf, uploaded.name)
+        else:
+            yield uploaded.name, uploaded.getvalue()
+
+
+def screen_resumes(backend, documents, job_description, cache=None, ingestor=None):
+    """Score every (name, bytes) document against ``job_description``; returns rows ranked by score.
+
+    With a DocumentIngestor, text extraction runs in parallel across its process pool."""
+    job_chunks = split_into_sentences(job_description)
+    if not job_chunks:
+        raise ValueError("Job description is too short for chunked similarity analysis.")
+    documents = list(documents)
+    if ingestor is not None:
+        texts = ingestor.extract_many(documents)
+    else:
+        texts = []
+        for name, data in documents:
+            try:
+                texts.append(extract_text(name, data))
+            except Exception as e:
+                texts.append(e)
+    rows, parsed = [], []
+    for (name, _), text in zip(documents, texts):
+        row = {"file": name, "score": None, "name": None, "email": None, "skills": "", "error": ""}
+        rows.append(row)
+        if isinstance(text, Exception):
+            row["error"] = f"Could not extract text: {text}"
+            continue
+        chunks = split_into_sentences(text or "")
+        if not chunks:
+            row["error"] = "Resume is too short for chunked similarity analysis."
+            continue
+        row.update(name=extract_name(text), email=extract_email(text), skills="; ".join(extract_skills(text)))
+        parsed.append((row, text, chunks))
+
+    # Embed the JD exactly once, then every resume sentence in maximal batches
+    job_embeds = embed_texts(backend, job_chunks, cache)
+    all_chunks = [c for _, _, chunks in parsed for c in chunks]
+    all_embeds = embed_texts(backend, all_chunks, cache) if all_chunks else np.zeros((0, job_embeds.shape[1]), dtype=np.float32)
+    offset = 0
+    for row, text, chunks in parsed:
+        resume_embeds = all_embeds[offset:offset + len(chunks)]
+        offset += len(chunks)
+        breakdown, _ = score_details(text, job_description, chunks, job_chunks, resume_embeds, job_embeds, backend)
+        row.update(score=breakdown["score"], embedding=breakdown["embedding"], keyword_overlap=breakdown["keyword_overlap"],
+                   coverage=breakdown["coverage"], scoring_version=breakdown["version"])
+
+    rows.sort(key=lambda r: (r["score"] is None, -(r["score"] or 0), r["file"]))
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
+
+
+def write_csv(rows, out):
+    writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({k: row.get(k) for k in RESULT_FIELDS})
+
+
+def write_json(rows, out):
+    json.dump([{k: row.get(k) for k in RESULT_FIELDS} for row in rows], out, indent=2)
+
+
+def load_api_key():
+    key = os.environ.get("COHERE_API_KEY")
+    if key:
+        return key
+    secrets_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+    if os.path.exists(secrets_path):
+        import tomllib
+        with open(secrets_path, "rb") as f:
+            return tomllib.load(f).get("COHERE_API_KEY")
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank resumes against a job description.")
+    parser.add_argument("inputs", nargs="+", help="resume files, directories or zip archives")
+    parser.add_argument("--jd", required=True, help="path to a text file with the job description")
+    parser.add_argument("--out", default="-", help="output path ending in .csv or .json (default: CSV on stdout)")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk embedding cache")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND, help="embedding backend; 'local' runs offline without an API key")
+    parser.add_argument("--base-url", default=os.environ.get("COHERE_BASE_URL"), help="Cohere API base URL (e.g. a local fake_cohere.py)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="processes for PDF/DOCX extraction (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    from cohere_service import CohereService
+    from embedding_cache import EmbeddingCache
+
+    api_key = load_api_key()
+    if args.backend == "cohere" and not api_key and not args.base_url:
+        parser.error("Set COHERE_API_KEY or add it to .streamlit/secrets.toml, or use --backend local")
+    with open(args.jd, "r", encoding="utf-8") as f:
+        job_description = f.read()
+    cache = None if args.no_cache else EmbeddingCache()
+    service = CohereService(api_key or "local", base_url=args.base_url) if args.backend == "cohere" else None
+    backend = get_backend(args.backend, service)
+    ingestor = DocumentIngestor(max_workers=args.workers)
+    try:
+        rows = screen_resumes(backend, iter_documents(args.inputs), job_description, cache, ingestor)
+    finally:
+        ingestor.close()
+        if cache is not None:
+            cache.close()
+        if service is not None:
+            service.close()
+
+    writer = write_json if args.out.endswith(".json") else write_csv
+    if args.out == "-":
+        writer(rows, sys.stdout)
+    else:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            writer(rows, f)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Screened {len(rows)} resumes; embedding cache {stats['hits']} hits / {stats['misses']} misses", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Per-stage benchmark of one resume analysis on synthetic documents.
+
+Run from the repo root:
+
+    python benchmarks/bench_pipeline.py --iterations 20 --resume-sentences 60 --out bench.json
+    python benchmarks/bench_pipeline.py --compare bench.json   # after a change
+
+Each iteration parses a fresh synthetic resume (as PDF and as DOCX) and JD, then
+runs field extraction, keyword matching, sentence splitting, embedding,
+similarity scoring, feedback generation and gauge rendering. Cohere calls go
+to the in-process fake API (fake_cohere.py), so results measure this code plus
+a loopback HTTP round trip (``--latency`` adds simulated API time). Latency
+percentiles and throughput come from untraced runs; peak memory comes from one
+extra traced run per stage.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.backends.backend_pdf import PdfPages  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+import analysis  # noqa: E402
+import document  # noqa: E402
+from charts import score_gauge_svg  # noqa: E402
+from cohere_service import CohereService  # noqa: E402
+from embedding_backends import CohereEmbeddingBackend  # noqa: E402
+from fake_cohere import start_fake_cohere  # noqa: E402
+from ingest import extract_text  # noqa: E402
+from keywords import load_taxonomy  # noqa: E402
+from profiling import StageTimer  # noqa: E402
+
+FIRST_NAMES = ("Jane", "Omar", "Priya", "Lucas", "Mei", "Tunde", "Sofia", "Arjun")
+LAST_NAMES = ("Doe", "Haddad", "Sharma", "Silva", "Chen", "Okafor", "Rossi", "Mehta")
+VERBS = ("Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Maintained", "Delivered")
+OBJECTS = ("data pipelines", "REST services", "a reporting platform", "the CI/CD workflow",
+           "customer dashboards", "a recommendation engine", "internal tooling", "the billing system")
+IMPACTS = ("cutting latency by {n}%", "serving {n}k daily users", "saving {n} hours per week",
+           "reducing cloud spend by {n}%", "improving conversion by {n}%")
+JD_OPENERS = ("Experience with", "Strong knowledge of", "Hands-on skills in", "Familiarity with")
+
+
+# --- Synthetic documents ---
+def _skills(rng, n):
+    terms = sorted(load_taxonomy())
+    return [terms[i] for i in rng.choice(len(terms), size=n, replace=False)]
+
+
+def synthetic_resume(rng, n_sentences):
+    skills = _skills(rng, 12)
+    lines = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"candidate{rng.integers(10000)}@example.com | +1 555 {rng.integers(100, 999)} {rng.integers(1000, 9999)}",
+        "Skills: " + ", ".join(skills),
+        "Education",
+        "BSc Computer Science, State University, 2016",
+        "Experience",
+    ]
+    for _ in range(n_sentences):
+        impact = rng.choice(IMPACTS).format(n=rng.integers(5, 60))
+        lines.append(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}, {impact}.")
+    return "\n".join(lines)
+
+
+def synthetic_jd(rng, n_sentences):
+    skills = _skills(rng, 10)
+    lines = ["We are hiring a software engineer to join our platform team."]
+    for _ in range(n_sentences):
+        lines.append(f"{rng.choice(JD_OPENERS)} {rng.choice(skills)} and {rng.choice(OBJECTS)} is required.")
+    return "\n".join(lines)
+
+
+def to_pdf(text, lines_per_page=50):
+    lines = text.splitlines()
+    buf = io.BytesIO()
+    with PdfPages(buf) as pdf:
+        for start in range(0, len(lines), lines_per_page):
+            fig = plt.figure(figsize=(8.5, 11))
+            for row, line in enumerate(lines[start:start + lines_per_page]):
+                fig.text(0.05, 0.97 - row * 0.019, line, fontsize=8)
+            pdf.savefig(fig)
+            plt.close(fig)
+    return buf.getvalue()
+
+
+def to_docx(text):
+    # Just enough WordprocessingML for docx2txt: one paragraph per line
+    paragraphs = "".join(f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in text.splitlines())
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{paragraphs}</w:body></w:document>')
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("word/document.xml", document)
+    return buf.getvalue()
+
+
+# --- Stages ---
+def run_pipeline(timer, backend, service, resume_text, pdf_bytes, docx_bytes, job_description):
+    with timer.stage("pdf_extract"):
+        extract_text("resume.pdf", pdf_bytes)
+    with timer.stage("docx_extract"):
+        extract_text("resume.docx", docx_bytes)
+    with timer.stage("extract_fields"):
+        analysis.extract_fields(resume_text)
+    with timer.stage("extract_keywords"):
+        # Bypass the memo so every call does the work
+        analysis.extract_keywords.__wrapped__(resume_text)
+        analysis.extract_keywords.__wrapped__(job_description)
+    with timer.stage("split_sentences"):
+        # extract_fields already parsed the resume; clear the memo so this stage does the work
+        document.parse_document.cache_clear()
+        resume_chunks = analysis.split_into_sentences(resume_text)
+        job_chunks = analysis.split_into_sentences(job_description)
+    with timer.stage("embed"):
+        embeds = analysis.embed_texts(backend, resume_chunks + job_chunks)
+    with timer.stage("similarity"):
+        match_score, _ = analysis.score_match(
+            resume_text, job_description, resume_chunks, job_chunks,
+            embeds[:len(resume_chunks)], embeds[len(resume_chunks):], backend)
+    with timer.stage("generate"):
+        for _ in analysis.stream_ai_feedback(service, resume_text, job_description):
+            pass
+    with timer.stage("gauge_render"):
+        score_gauge_svg.__wrapped__(match_score)  # uncached build, as on a first render
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    print(f"\n{'stage':<18} {'p50 before':>11} {'p50 after':>11} {'change':>8}")
+    for name, row in results["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before:
+            continue
+        change = (row["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0
+        print(f"{name:<18} {before['p50_ms']:>11.3f} {row['p50_ms']:>11.3f} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--resume-sentences", type=int, default=40, help="experience bullets per synthetic resume")
+    parser.add_argument("--jd-sentences", type=int, default=12, help="requirements per synthetic JD")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated Cohere response time (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write results as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run to compare p50s against")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"Generating {args.iterations + 1} synthetic resume/JD pairs...", file=sys.stderr)
+    docs = []
+    for _ in range(args.iterations + 1):
+        resume_text = synthetic_resume(rng, args.resume_sentences)
+        docs.append((resume_text, to_pdf(resume_text), to_docx(resume_text), synthetic_jd(rng, args.jd_sentences)))
+
+    server, url = start_fake_cohere(latency=args.latency)
+    service = CohereService("bench", base_url=url)
+    backend = CohereEmbeddingBackend(service)
+    try:
+        run_pipeline(StageTimer(), backend, service, *docs[0])  # warm-up: imports, connections, taxonomy
+        timer = StageTimer()
+        started = time.perf_counter()
+        for doc in docs[1:]:
+            run_pipeline(timer, backend, service, *doc)
+        wall = time.perf_counter() - started
+        memory = StageTimer(trace_memory=True)
+        run_pipeline(memory, backend, service, *docs[0])
+    finally:
+        service.close()
+        server.shutdown()
+
+    stages = timer.summary()
+    for name, row in memory.summary().items():
+        stages[name]["peak_mb"] = row["peak_mb"]
+    results = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "params": vars(args),
+        "documents_per_s": round(args.iterations / wall, 2),
+        "stages": stages,
+    }
+
+    print(f"{'stage':<18} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'peak MB':>9}")
+    for name, row in stages.items():
+        print(f"{name:<18} {row['p50_ms']:>9.3f} {row['p90_ms']:>9.3f} {row['p99_ms']:>9.3f} "
+              f"{row['throughput_per_s']:>9.1f} {row['peak_mb']:>9.2f}")
+    print(f"End to end: {results['documents_per_s']} documents/s")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
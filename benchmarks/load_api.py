@@ -0,0 +1,108 @@
+"""Load test for api_server.py against a stubbed embedding backend.
+
+Run from the repo root:
+
+    python benchmarks/load_api.py --requests 2000 --concurrency 64 --unique 100
+    python benchmarks/load_api.py --url http://127.0.0.1:8080   # an already running server
+
+Without --url an API server is started in-process on the local hashing
+backend (no network, no API key). Requests are /v1/score calls drawn from
+``--unique`` distinct synthetic resume/JD pairs, so concurrent duplicates
+exercise request coalescing, and a small ``--max-pending`` exercises the
+503 backpressure path. Prints client-side latency percentiles, throughput
+and status counts, then the server's /metrics counters.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_pipeline import synthetic_jd, synthetic_resume  # noqa: E402
+from profiling import StageTimer  # noqa: E402
+
+
+def post(url, body, timeout=60):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+    except OSError:
+        return "connection error"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running api_server.py (default: start one in-process)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--unique", type=int, default=50, help="distinct resume/JD pairs in the request mix")
+    parser.add_argument("--resume-sentences", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4, help="in-process server: concurrent computations")
+    parser.add_argument("--max-pending", type=int, default=64, help="in-process server: queue bound before 503s")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write client and server results as JSON to this path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    bodies = [
+        json.dumps({"resume_text": synthetic_resume(rng, args.resume_sentences), "job_description": synthetic_jd(rng, 12)}).encode("utf-8")
+        for _ in range(args.unique)
+    ]
+    mix = rng.integers(len(bodies), size=args.requests)
+
+    server = service = None
+    url = args.url
+    if url is None:
+        from api_server import ScoringService, start_api_server
+        from embedding_backends import get_backend
+        service = ScoringService(get_backend("local"), workers=args.workers, max_pending=args.max_pending)
+        server, url = start_api_server(service)
+    score_url = url.rstrip("/") + "/v1/score"
+
+    timer = StageTimer(max_samples=args.requests)
+    statuses = Counter()
+
+    def one(i):
+        with timer.stage("score"):
+            status = post(score_url, bodies[i])
+        statuses[status] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(one, mix))
+    wall = time.perf_counter() - started
+
+    with urllib.request.urlopen(url.rstrip("/") + "/metrics") as response:
+        metrics = json.load(response)
+    if server is not None:
+        server.shutdown()
+        service.close()
+
+    client = timer.summary()["score"]
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.unique} unique: "
+          f"{args.requests / wall:.1f} req/s over {wall:.2f}s")
+    print(f"latency ms: p50 {client['p50_ms']:.1f}  p90 {client['p90_ms']:.1f}  p99 {client['p99_ms']:.1f}")
+    print("status:", dict(sorted(statuses.items(), key=str)))
+    print("server:", {k: metrics[k] for k in ("computed", "coalesced", "rejected", "errors")})
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"params": vars(args), "requests_per_s": round(args.requests / wall, 2), "client": client,
+                       "status": {str(k): v for k, v in statuses.items()}, "server": metrics}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
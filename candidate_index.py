@@ -0,0 +1,361 @@
+"""Persistent resume corpus for "find the best resumes for this JD" queries.
+
+    python candidate_index.py add resumes/ more.zip --index .cache/candidates --backend local
+    python candidate_index.py search --jd job.txt -k 20 --index .cache/candidates --backend local
+    python candidate_index.py delete resumes/jane.pdf --index .cache/candidates
+
+On disk an index is a directory holding:
+
+- ``sentences.f32``: every stored sentence embedding (L2-normalized) in one
+  contiguous, memory-mapped float32 matrix;
+- ``centroids.f32``: one normalized mean embedding per candidate, also memory-mapped;
+- ``candidates.jsonl``: an append-only log of add/delete records carrying each
+  candidate's row range and extracted fields (skills, education, experience).
+  Contact details (name, email, phone) are not stored.
+
+A search scores every live centroid against the JD with one matrix-vector
+product, shortlists the best with argpartition, then re-ranks the shortlist on
+the app's deterministic score (analysis.score_breakdown). An index only opens
+under the SCORING_VERSION it was built with, since it stores extracted
+keywords. Adds and deletes only append, so a deleted candidate's record stays
+on disk until ``compact`` rewrites the index without it.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import threading
+
+import numpy as np
+
+from analysis import extract_fields, extract_keywords, split_into_sentences, embed_texts, score_breakdown, SCORING_VERSION
+from similarity import normalize_rows
+
+DEFAULT_INDEX_DIR = os.environ.get("RESUME_CANDIDATE_INDEX", os.path.join(".cache", "candidates"))
+_INITIAL_CAPACITY = 1024
+CONTACT_FIELDS = ("name", "email", "phone")  # never written to the index
+
+
+def _open_matrix(path, capacity, dim, mode="r+"):
+    return np.memmap(path, dtype=np.float32, mode=mode, shape=(capacity, dim))
+
+
+def _grown(path, matrix, capacity, needed, dim):
+    """Return (matrix, capacity) with room for at least ``needed`` rows, doubling the file as required."""
+    if needed <= capacity:
+        return matrix, capacity
+    new_capacity = max(_INITIAL_CAPACITY, capacity)
+    while new_capacity < needed:
+        new_capacity *= 2
+    tmp_path = path + ".tmp"
+    grown = _open_matrix(tmp_path, new_capacity, dim, mode="w+")
+    if matrix is not None:
+        grown[:capacity] = matrix[:]
+        del matrix
+    grown.flush()
+    del grown
+    os.replace(tmp_path, path)
+    return _open_matrix(path, new_capacity, dim), new_capacity
+
+
+class CandidateIndex:
+    def __init__(self, root=DEFAULT_INDEX_DIR, backend_name=None):
+        self.root = root
+        self.backend_name = backend_name
+        self._lock = threading.Lock()
+        self._reset()
+        self._recover()
+        self._load()
+
+    def _reset(self):
+        self.dim = None
+        self._sentences = self._centroids = None
+        self._sentence_capacity = self._centroid_capacity = 0
+        self._n_rows = 0
+        self._slots = []  # slot -> {"id", "start", "end", "fields", "keywords"}
+        self._alive = np.zeros(_INITIAL_CAPACITY, dtype=bool)  # slot -> not deleted
+        self._by_id = {}  # candidate id -> live slot
+
+    # --- Persistence ---
+    def _path(self, name):
+        return os.path.join(self.root, name)
+
+    def _load(self):
+        state_path = self._path("state.json")
+        if not os.path.exists(state_path):
+            return
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if self.backend_name and state["backend"] != self.backend_name:
+            raise ValueError(f"Index at {self.root} was built with the {state['backend']!r} embedding backend, not {self.backend_name!r}.")
+        if state.get("scoring_version") != SCORING_VERSION:
+            # Stored keywords came from another extractor or taxonomy and would skew every score
+            raise ValueError(f"Index at {self.root} was built with scoring version {state.get('scoring_version')!r}, "
+                             f"not {SCORING_VERSION!r}; delete it and add the resumes again.")
+        self.backend_name = state["backend"]
+        self.dim = state["dim"]
+        self._sentence_capacity = state["sentence_capacity"]
+        self._centroid_capacity = state["centroid_capacity"]
+        self._sentences = _open_matrix(self._path("sentences.f32"), self._sentence_capacity, self.dim)
+        self._centroids = _open_matrix(self._path("centroids.f32"), self._centroid_capacity, self.dim)
+        log_path = self._path("candidates.jsonl")
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record["op"] == "add":
+                    self._apply_add(record)
+                else:
+                    slot = self._by_id.pop(record["id"], None)
+                    if slot is not None:
+                        self._alive[slot] = False
+
+    def _apply_add(self, record):
+        slot = len(self._slots)
+        if slot >= len(self._alive):
+            self._alive = np.concatenate([self._alive, np.zeros(len(self._alive), dtype=bool)])
+        self._alive[slot] = True
+        self._by_id[record["id"]] = slot
+        self._slots.append(record)
+        self._n_rows = max(self._n_rows, record["end"])
+
+    def _append_log(self, *records):
+        with open(self._path("candidates.jsonl"), "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+
+    def _save_state(self):
+        state = {
+            "backend": self.backend_name, "scoring_version": SCORING_VERSION, "dim": self.dim,
+            "sentence_capacity": self._sentence_capacity, "centroid_capacity": self._centroid_capacity,
+        }
+        tmp_path = self._path("state.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._path("state.json"))
+
+    # --- Mutation ---
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._by_id
+
+    def add(self, candidate_id, sentence_embeds, fields=None, keywords=()):
+        """Store (or replace) a candidate's sentence embeddings and extracted fields."""
+        self.add_many([(candidate_id, sentence_embeds, fields, keywords)])
+
+    def add_many(self, candidates):
+        """Add ``(candidate_id, sentence_embeds, fields, keywords)`` tuples with one flush and one log write."""
+        # Later entries for the same id replace earlier ones
+        candidates = list({cid: (cid, normalize_rows(embeds), fields, keywords)
+                           for cid, embeds, fields, keywords in candidates}.values())
+        for cid, embeds, _, _ in candidates:
+            if embeds.ndim != 2 or not len(embeds):
+                raise ValueError(f"Candidate {cid!r} has no sentence embeddings.")
+        if not candidates:
+            return
+        with self._lock:
+            if self.dim is None:
+                os.makedirs(self.root, exist_ok=True)
+                self.dim = candidates[0][1].shape[1]
+            for cid, embeds, _, _ in candidates:
+                if embeds.shape[1] != self.dim:
+                    raise ValueError(f"Embedding dimension {embeds.shape[1]} does not match the index ({self.dim}).")
+            for cid, _, _, _ in candidates:
+                if cid in self._by_id:
+                    self._delete_locked(cid)
+            n_sentences = sum(len(embeds) for _, embeds, _, _ in candidates)
+            self._sentences, self._sentence_capacity = _grown(
+                self._path("sentences.f32"), self._sentences, self._sentence_capacity, self._n_rows + n_sentences, self.dim)
+            self._centroids, self._centroid_capacity = _grown(
+                self._path("centroids.f32"), self._centroids, self._centroid_capacity, len(self._slots) + len(candidates), self.dim)
+            records = []
+            start, slot = self._n_rows, len(self._slots)
+            for cid, embeds, fields, keywords in candidates:
+                end = start + len(embeds)
+                self._sentences[start:end] = embeds
+                self._centroids[slot] = normalize_rows(embeds.mean(axis=0, keepdims=True))[0]
+                records.append({"op": "add", "id": cid, "start": start, "end": end,
+                                "fields": fields or {}, "keywords": sorted(keywords)})
+                start, slot = end, slot + 1
+            self._sentences.flush()
+            self._centroids.flush()
+            self._save_state()
+            self._append_log(*records)
+            for record in records:
+                self._apply_add(record)
+
+    def _delete_locked(self, candidate_id):
+        slot = self._by_id.pop(candidate_id)
+        self._alive[slot] = False
+        self._append_log({"op": "delete", "id": candidate_id})
+
+    def delete(self, candidate_id):
+        with self._lock:
+            if candidate_id not in self._by_id:
+                return False
+            self._delete_locked(candidate_id)
+            return True
+
+    def compact(self):
+        """Rewrite the index without deleted candidates.
+
+        The new index is built in a fresh sibling directory and swapped in with
+        two renames; ``_recover`` finishes or rolls back a swap cut short by a crash."""
+        with self._lock:
+            live = [(cid, self._slots[slot]) for cid, slot in self._by_id.items()]
+            sentences = [np.array(self._sentences[r["start"]:r["end"]]) for _, r in live]
+            building, retired = self.root + ".compact", self.root + ".old"
+            shutil.rmtree(building, ignore_errors=True)  # never build on top of an interrupted compaction
+            os.makedirs(building)
+            tmp = CandidateIndex(building, self.backend_name)
+            tmp.add_many((cid, embeds, record["fields"], record["keywords"])
+                         for (cid, record), embeds in zip(live, sentences))
+            del tmp
+            self._reset()  # drop the memmaps before moving their files
+            shutil.rmtree(retired, ignore_errors=True)
+            if os.path.isdir(self.root):
+                os.replace(self.root, retired)
+            os.replace(building, self.root)
+            shutil.rmtree(retired, ignore_errors=True)
+            self._load()
+
+    def _recover(self):
+        """Finish a compaction that crashed between its two renames."""
+        retired = self.root + ".old"
+        if not os.path.isdir(retired):
+            return
+        if os.path.isdir(self.root):
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(retired, self.root)  # the new index never landed; keep the old one
+
+    # --- Retrieval ---
+    def search(self, job_embeds, jd_keywords=frozenset(), k=10, shortlist_factor=10, backend=None):
+        """Rank live candidates for a JD given its sentence embeddings; returns the top ``k``.
+        ``backend`` (the index's embedding backend) supplies the scoring thresholds."""
+        with self._lock:
+            n_slots = len(self._slots)
+            if not len(self._by_id):
+                return []
+            job_embeds = normalize_rows(job_embeds)
+            # Stage 1: centroid similarity for every candidate in one matrix-vector product
+            query = normalize_rows(job_embeds.mean(axis=0, keepdims=True))[0]
+            coarse = np.asarray(self._centroids[:n_slots]) @ query
+            coarse[~self._alive[:n_slots]] = -np.inf
+            n_short = min(len(self._by_id), max(k * shortlist_factor, k))
+            shortlist = np.argpartition(coarse, -n_short)[-n_short:]
+            # Stage 2: full sentence-level score on the shortlist
+            results = []
+            for slot in shortlist:
+                record = self._slots[slot]
+                sims = job_embeds @ np.asarray(self._sentences[record["start"]:record["end"]]).T
+                breakdown = score_breakdown(sims, frozenset(record["keywords"]), jd_keywords, backend)
+                results.append({
+                    "id": record["id"],
+                    "score": breakdown.pop("score"),
+                    "breakdown": breakdown,
+                    "fields": record["fields"],
+                })
+        results.sort(key=lambda r: (-r["score"], -r["breakdown"]["avg_top_similarity"], r["id"]))
+        return results[:k]
+
+
+def index_documents(index, backend, documents, cache=None, ingestor=None):
+    """Parse, embed and add (name, bytes) documents; returns the number added."""
+    from ingest import extract_text
+    documents = list(documents)
+    texts = ingestor.extract_many(documents) if ingestor is not None else [extract_text(n, d) for n, d in documents]
+    parsed = []
+    for (name, _), text in zip(documents, texts):
+        if isinstance(text, Exception) or not text:
+            print(f"Skipping {name}: could not extract text", file=sys.stderr)
+            continue
+        chunks = split_into_sentences(text)
+        if not chunks:
+            print(f"Skipping {name}: too short to index", file=sys.stderr)
+            continue
+        parsed.append((name, text, chunks))
+    if not parsed:
+        return 0
+    # Every resume's sentences in one embed call (maximal API batches, one cache commit), then sliced back
+    all_embeds = embed_texts(backend, [c for _, _, chunks in parsed for c in chunks], cache)
+    batch, offset = [], 0
+    for name, text, chunks in parsed:
+        fields = {k: v for k, v in extract_fields(text).items() if k not in CONTACT_FIELDS}
+        batch.append((name, all_embeds[offset:offset + len(chunks)], fields, extract_keywords(text)))
+        offset += len(chunks)
+    index.add_many(batch)
+    return len(batch)
+
+
+def search_index(index, backend, job_description, k=10, cache=None):
+    job_chunks = split_into_sentences(job_description)
+    if not job_chunks:
+        raise ValueError("Job description is too short for chunked similarity analysis.")
+    return index.search(embed_texts(backend, job_chunks, cache), extract_keywords(job_description), k, backend=backend)
+
+
+def main(argv=None):
+    from batch_screen import iter_documents, load_api_key
+    from embedding_backends import get_backend, BACKENDS, DEFAULT_BACKEND
+    from embedding_cache import EmbeddingCache
+
+    parser = argparse.ArgumentParser(description="Store resumes and find the best ones for a job description.")
+    parser.add_argument("--index", default=DEFAULT_INDEX_DIR, help="index directory")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--base-url", default=os.environ.get("COHERE_BASE_URL"))
+    sub = parser.add_subparsers(dest="command", required=True)
+    add_p = sub.add_parser("add", help="add or replace resumes")
+    add_p.add_argument("inputs", nargs="+", help="resume files, directories or zip archives")
+    search_p = sub.add_parser("search", help="rank stored resumes for a job description")
+    search_p.add_argument("--jd", required=True, help="path to a text file with the job description")
+    search_p.add_argument("-k", type=int, default=10)
+    delete_p = sub.add_parser("delete", help="remove resumes by id (their file path)")
+    delete_p.add_argument("ids", nargs="+")
+    sub.add_parser("compact", help="purge deleted resumes from disk and reclaim their space")
+    args = parser.parse_args(argv)
+
+    service = None
+    if args.command in ("add", "search"):
+        if args.backend == "cohere":
+            from cohere_service import CohereService
+            api_key = load_api_key()
+            if not api_key and not args.base_url:
+                parser.error("Set COHERE_API_KEY or add it to .streamlit/secrets.toml, or use --backend local")
+            service = CohereService(api_key or "local", base_url=args.base_url)
+        backend = get_backend(args.backend, service)
+        index = CandidateIndex(args.index, backend.name)
+    else:
+        index = CandidateIndex(args.index)
+    try:
+        if args.command == "add":
+            from ingest import DocumentIngestor
+            ingestor = DocumentIngestor()
+            try:
+                added = index_documents(index, backend, iter_documents(args.inputs), EmbeddingCache(), ingestor)
+            finally:
+                ingestor.close()
+            print(f"Added {added} resumes; index holds {len(index)}", file=sys.stderr)
+        elif args.command == "search":
+            with open(args.jd, "r", encoding="utf-8") as f:
+                results = search_index(index, backend, f.read(), args.k, EmbeddingCache())
+            json.dump(results, sys.stdout, indent=2)
+            print()
+        elif args.command == "delete":
+            for candidate_id in args.ids:
+                if not index.delete(candidate_id):
+                    print(f"Not in index: {candidate_id}", file=sys.stderr)
+        elif args.command == "compact":
+            index.compact()
+    finally:
+        if service is not None:
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
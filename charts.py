@@ -0,0 +1,31 @@
+"""Score visualizations for the app, kept free of Streamlit so they can be benchmarked."""
+from functools import lru_cache
+
+GAUGE_BANDS = ((0, 50, '#ef4444'), (50, 80, '#facc15'), (80, 100, '#22c55e'))  # red <50, yellow 50-79, green 80+
+GAUGE_TICKS = (0, 50, 80, 100)
+
+
+@lru_cache(maxsize=101)
+def score_gauge_svg(match_score):
+    """Horizontal red/yellow/green gauge with a marker at ``match_score`` (0-100), as inline SVG.
+
+    Plain markup is cheap to build and send on every rerun, and there is no
+    figure to close; each of the 101 possible scores is built once."""
+    width, left, right = 600, 12, 588
+    def x(value):
+        return left + (right - left) * value / 100
+    bands = "".join(
+        f'<rect x="{x(lo):.1f}" y="40" width="{x(hi) - x(lo):.1f}" height="10" fill="{color}"/>'
+        for lo, hi, color in GAUGE_BANDS
+    )
+    ticks = "".join(
+        f'<text x="{x(t):.1f}" y="72" fill="#f3f4f6" font-size="13" text-anchor="middle">{t}</text>'
+        for t in GAUGE_TICKS
+    )
+    pos = x(min(max(match_score, 0), 100))
+    marker = f'<polygon points="{pos - 10:.1f},14 {pos + 10:.1f},14 {pos:.1f},36" fill="#2563eb"/>'
+    return (
+        f'<svg viewBox="0 0 {width} 80" width="100%" role="img" aria-label="Match score {match_score} out of 100" '
+        f'xmlns="http://www.w3.org/2000/svg" style="background:#111827;max-width:{width}px;">'
+        f'{bands}{marker}{ticks}</svg>'
+    )
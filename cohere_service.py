@@ -0,0 +1,189 @@
+"""Process-wide async Cohere service.
+
+One cohere.AsyncClient (and therefore one pooled HTTP connection set) lives on
+a dedicated event-loop thread. Every request goes through a bounded semaphore
+and is retried with exponential backoff on 429/5xx and transport errors.
+Synchronous callers (Streamlit, batch_screen.py) use the blocking wrappers,
+which schedule coroutines on that loop.
+"""
+import asyncio
+import os
+import queue
+import random
+import threading
+
+import cohere
+import httpx
+
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("COHERE_MAX_CONCURRENCY", "8"))
+DEFAULT_MAX_RETRIES = int(os.environ.get("COHERE_MAX_RETRIES", "5"))
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+_END_OF_STREAM = object()
+
+
+def is_retryable(error):
+    if isinstance(error, (httpx.TransportError, asyncio.TimeoutError)):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS
+
+
+def _retry_after(error):
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenStream:
+    """Iterator over a streamed generation's text chunks; ``close()`` cancels the
+    request, even before iteration has started."""
+
+    def __init__(self, chunks, future):
+        self._chunks = chunks
+        self._future = future
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._closed:
+            raise StopIteration
+        item = self._chunks.get()
+        if item is _END_OF_STREAM:
+            self.close()
+            raise StopIteration
+        if isinstance(item, BaseException):
+            self.close()
+            raise item
+        return item
+
+    def close(self):
+        self._closed = True
+        self._future.cancel()
+
+    __del__ = close
+
+
+class CohereService:
+    def __init__(self, api_key, base_url=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=0.5, backoff_max=20.0, timeout=60.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="cohere-service", daemon=True)
+        self._thread.start()
+
+        async def _setup():
+            # Created on the service loop, which is the only loop that will ever use them
+            http = httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            )
+            client = cohere.AsyncClient(api_key, base_url=base_url, timeout=timeout, max_retries=0, httpx_client=http)
+            return http, client, asyncio.Semaphore(max_concurrency)
+
+        self._http, self.client, self._semaphore = self.run(_setup())
+
+    # --- Blocking helpers for synchronous callers ---
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def embed(self, texts, model, input_type):
+        return self.run(self.aembed(texts, model, input_type))
+
+    def embed_batches(self, batches, model, input_type):
+        """Embed several batches concurrently; returns one list of vectors per batch."""
+        async def _all():
+            return await asyncio.gather(*(self.aembed(b, model, input_type) for b in batches))
+        return self.run(_all())
+
+    def generate(self, prompt, model, max_tokens, temperature):
+        return self.run(self.agenerate(prompt, model, max_tokens, temperature))
+
+    def generate_stream(self, prompt, model, max_tokens, temperature):
+        """Start a streamed generation right away and return an iterator over its text chunks.
+
+        Chunks are buffered while the caller is busy elsewhere; closing the
+        returned TokenStream cancels the request."""
+        chunks = queue.Queue()
+
+        async def _pump():
+            try:
+                async for text in self.agenerate_stream(prompt, model, max_tokens, temperature):
+                    chunks.put(text)
+                chunks.put(_END_OF_STREAM)
+            except BaseException as e:
+                chunks.put(e)
+                raise
+
+        return TokenStream(chunks, asyncio.run_coroutine_threadsafe(_pump(), self._loop))
+
+    # --- Async API ---
+    async def _backoff(self, error, attempt):
+        delay = _retry_after(error)
+        if delay is None:
+            delay = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+        self.retries += 1
+        await asyncio.sleep(delay)
+
+    async def _call(self, make_request):
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    return await make_request()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                await self._backoff(e, attempt)
+                attempt += 1
+
+    async def aembed(self, texts, model, input_type):
+        response = await self._call(lambda: self.client.embed(
+            texts=texts,
+            model=model,
+            embedding_types=["float"],
+            input_type=input_type
+        ))
+        return response.embeddings
+
+    async def agenerate(self, prompt, model, max_tokens, temperature):
+        response = await self._call(lambda: self.client.generate(
+            model=model,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature
+        ))
+        return response.generations[0].text
+
+    async def agenerate_stream(self, prompt, model, max_tokens, temperature):
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async with self._semaphore:
+                    async for event in self.client.generate_stream(
+                        model=model,
+                        prompt=prompt,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    ):
+                        if getattr(event, "event_type", None) == "text-generation" and event.text:
+                            started = True
+                            yield event.text
+                return
+            except Exception as e:
+                # Once text has reached the caller a retry would duplicate it
+                if started or attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                await self._backoff(e, attempt)
+                attempt += 1
+
+    def close(self):
+        if self._loop.is_running():
+            self.run(self._http.aclose())
+            self._loop.call_soon_threadsafe(self._loop.stop)
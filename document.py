@@ -0,0 +1,149 @@
+"""Parsed document model: lines, sentences and sections with character offsets.
+
+``parse_document(text)`` walks the text line by line, recognizing section
+headings ("Skills", "Work Experience", "EDUCATION:", "Skills: Python, SQL",
+...), and cuts it into sentences on "\n" and . ! ?. Field extraction and the
+embedding stage in analysis.py all read from this model, which is memoized per
+document, instead of re-scanning the raw text with their own regexes.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+Span = namedtuple("Span", "start end text")  # text == document[start:end]
+
+SECTION_ALIASES = {
+    "summary": ("summary", "professional summary", "profile", "objective", "career objective", "about me"),
+    "skills": ("skills", "technical skills", "key skills", "core skills", "core competencies", "competencies",
+               "technologies", "tech stack", "tools"),
+    "experience": ("experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "career history"),
+    "education": ("education", "academic background", "qualifications", "education and training"),
+    "projects": ("projects", "personal projects", "key projects", "selected projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications"),
+    "awards": ("awards", "honors", "achievements", "awards and honors"),
+    "publications": ("publications",),
+    "languages": ("languages",),
+    "interests": ("interests", "hobbies"),
+    "volunteering": ("volunteering", "volunteer experience"),
+    "references": ("references",),
+}
+_HEADINGS = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+_MAX_HEADING_WORDS = max(len(alias.split()) for alias in _HEADINGS)
+_BULLETS = "-*•·▪‣–—#>"
+_SENTENCE_RE = re.compile(r"[^\n.!?]+")  # only "\n" ends a line here, unlike str.splitlines
+_SKILL_SUBLISTS = ("languages",)  # "Languages: Python, Go" under Skills is a list, not a new section
+# Inside a job or project entry, "Tools: Jira, Docker" or "Technologies: ..." describes that entry
+_ENTRY_SECTIONS = ("experience", "projects", "volunteering")
+_ENTRY_DETAILS = ("skills", "languages")
+MIN_SENTENCE_CHARS = 20  # shorter fragments (dates, bare titles) are not embedded
+
+
+class Section:
+    """A titled part of the document; ``body`` is everything after the heading up to the next one."""
+
+    def __init__(self, name, heading, start, body_start, end, lines):
+        self.name = name
+        self.heading = heading  # as written, e.g. "WORK EXPERIENCE"
+        self.start = start
+        self.body_start = body_start
+        self.end = end
+        self.lines = lines  # non-empty body lines as stripped Spans
+
+    def __repr__(self):
+        return f"Section({self.name!r}, {self.start}:{self.end}, {len(self.lines)} lines)"
+
+
+class Document:
+    def __init__(self, text, lines, sentences, sections):
+        self.text = text
+        self.lines = lines  # non-empty lines as stripped Spans
+        self.sentences = sentences  # Spans longer than MIN_SENTENCE_CHARS, split on "\n" and . ! ?
+        self.sections = sections  # in document order; text before the first heading is "header"
+
+    def section(self, name):
+        """First section with this canonical name, or None."""
+        for section in self.sections:
+            if section.name == name:
+                return section
+        return None
+
+    def sections_named(self, name):
+        """Every section with this canonical name, in document order."""
+        return [section for section in self.sections if section.name == name]
+
+    def body(self, name):
+        section = self.section(name)
+        return self.text[section.body_start:section.end] if section else ""
+
+
+def _strip_span(text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _heading(line):
+    """Return (canonical name, chars of ``line`` the heading takes up) if the line starts a section."""
+    label, sep, _ = line.partition(":")
+    words = label.strip(_BULLETS + " \t").lower().replace("&", "and").split()
+    if not words or len(words) > _MAX_HEADING_WORDS:
+        return None
+    name = _HEADINGS.get(" ".join(words))
+    if name is None:
+        return None
+    # "Skills" and "SKILLS:" stand alone; "Skills: Python, SQL" carries its content inline
+    return name, (len(label) + len(sep)) if sep else len(line)
+
+
+def _continues_section(current, heading, line):
+    """Whether a heading-like line belongs to the current section: a repeated heading
+    ("Skills" under "Technical Skills"), a labelled list inside Skills ("Languages: Python, Go"),
+    or a labelled detail of a job or project entry ("Tools: Jira, Docker")."""
+    name, consumed = heading
+    if name == current.name:
+        return True
+    if consumed == len(line):
+        return False  # a standalone heading always starts a section
+    if current.name == "skills":
+        return name in _SKILL_SUBLISTS
+    return current.name in _ENTRY_SECTIONS and name in _ENTRY_DETAILS
+
+
+@lru_cache(maxsize=256)
+def parse_document(text):
+    """Parse ``text`` into a Document. Memoized, so every extractor shares one parse per document."""
+    lines, sentences, sections = [], [], []
+    current = Section("header", "", 0, 0, len(text), [])
+    pos = 0
+    for raw in text.splitlines(keepends=True):
+        line_start, line_end = _strip_span(text, pos, pos + len(raw))
+        pos += len(raw)
+        if line_start == line_end:
+            continue
+        line = text[line_start:line_end]
+        lines.append(Span(line_start, line_end, line))
+        heading = _heading(line)
+        if heading and _continues_section(current, heading, line):
+            heading = None
+        content_start = line_start
+        if heading:
+            name, consumed = heading
+            current.end = line_start
+            sections.append(current)
+            content_start, _ = _strip_span(text, line_start + consumed, line_end)
+            current = Section(name, line[:consumed].rstrip(": \t"), line_start, content_start, len(text), [])
+        if content_start < line_end:
+            current.lines.append(Span(content_start, line_end, text[content_start:line_end]))
+    sections.append(current)
+    # Sentences come from their own scan: lines above also break on "\r", "\x0c", "\u2028", ...,
+    # which the embedded chunks never have
+    for m in _SENTENCE_RE.finditer(text):
+        start, end = _strip_span(text, m.start(), m.end())
+        if end - start > MIN_SENTENCE_CHARS:
+            sentences.append(Span(start, end, text[start:end]))
+    if len(sections) > 1 and not sections[0].lines:
+        sections.pop(0)  # nothing before the first heading
+    return Document(text, lines, sentences, sections)
@@ -0,0 +1,70 @@
+"""Plan co.embed requests: dedupe, truncate, pack into API-sized batches, scatter back.
+
+embed-english-v3.0 accepts at most 96 texts per request and reads at most 512
+tokens of each. Over-long "sentences" (e.g. whole lines without periods) are
+cut on a word boundary before sending rather than shipped in full.
+"""
+import os
+
+MAX_TEXTS_PER_BATCH = 96
+MAX_TOKENS_PER_TEXT = 512
+# Estimated tokens per request; keeps payloads small enough to avoid request-size rejections and timeouts
+MAX_TOKENS_PER_BATCH = int(os.environ.get("COHERE_EMBED_BATCH_TOKENS", "16384"))
+CHARS_PER_TOKEN = 4  # rough estimate for English text
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def truncate_text(text, max_tokens=MAX_TOKENS_PER_TEXT):
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[:cut if cut > max_chars // 2 else max_chars]
+
+
+def plan_batches(texts, max_texts=MAX_TEXTS_PER_BATCH, max_tokens=MAX_TOKENS_PER_BATCH):
+    """Return ``(unique_texts, batches, positions)``.
+
+    ``unique_texts`` are the deduplicated, truncated texts to send; ``batches``
+    is a list of index lists into ``unique_texts``, packed first-fit decreasing
+    so the number of requests stays minimal; ``positions[i]`` is the index in
+    ``unique_texts`` holding the vector for ``texts[i]``.
+    """
+    unique_texts, positions, seen = [], [], {}
+    for text in texts:
+        text = truncate_text(text)
+        if text not in seen:
+            seen[text] = len(unique_texts)
+            unique_texts.append(text)
+        positions.append(seen[text])
+
+    batches, batch_tokens = [], []
+    by_size = sorted(range(len(unique_texts)), key=lambda i: estimate_tokens(unique_texts[i]), reverse=True)
+    for i in by_size:
+        tokens = estimate_tokens(unique_texts[i])
+        for b, batch in enumerate(batches):
+            if len(batch) < max_texts and batch_tokens[b] + tokens <= max_tokens:
+                batch.append(i)
+                batch_tokens[b] += tokens
+                break
+        else:
+            batches.append([i])
+            batch_tokens.append(tokens)
+    return unique_texts, batches, positions
+
+
+def embed_planned(texts, embed_batches):
+    """Embed ``texts`` through ``embed_batches(list_of_text_lists) -> list_of_vector_lists``,
+    which may send the batches concurrently. Returns one vector per input text, in order."""
+    unique_texts, batches, positions = plan_batches(texts)
+    results = embed_batches([[unique_texts[i] for i in batch] for batch in batches])
+    vectors = [None] * len(unique_texts)
+    for batch, batch_vectors in zip(batches, results):
+        if len(batch_vectors) != len(batch):
+            raise ValueError("Cohere returned empty or malformed float embeddings. Please check your input text.")
+        for i, vec in zip(batch, batch_vectors):
+            vectors[i] = vec
+    return [vectors[p] for p in positions]
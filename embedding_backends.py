@@ -0,0 +1,113 @@
+"""Pluggable sentence-embedding backends.
+
+A backend has a ``name`` and ``input_type`` (together the EmbeddingCache
+namespace) and an ``embed(texts)`` method returning a float32 matrix with one
+row per text. ``unrelated_min_sim`` and ``coverage_sim`` calibrate
+analysis.score_breakdown to the backend's similarity scale. ``cohere`` calls the API; ``local`` is a CPU-only hashing
+vectorizer that needs no network or API key and is fully deterministic.
+"""
+import hashlib
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from embed_batching import embed_planned
+
+DEFAULT_BACKEND = os.environ.get("RESUME_EMBEDDING_BACKEND", "cohere")
+COHERE_EMBED_MODEL = "embed-english-v3.0"
+COHERE_INPUT_TYPE = "search_document"
+
+
+def _float_embeddings(embeddings, expected):
+    if isinstance(embeddings, list):
+        float_embeds = embeddings
+    elif hasattr(embeddings, "float_"):
+        float_embeds = embeddings.float_
+    else:
+        raise ValueError("Cohere did not return valid float embeddings. Please check your API key, input text, and Cohere API status.")
+    if not isinstance(float_embeds, list) or len(float_embeds) != expected:
+        raise ValueError("Cohere returned empty or malformed float embeddings. Please check your input text.")
+    return float_embeds
+
+
+class CohereEmbeddingBackend:
+    unrelated_min_sim = 0.05
+    coverage_sim = 0.4
+
+    def __init__(self, service, model=COHERE_EMBED_MODEL, input_type=COHERE_INPUT_TYPE):
+        self.service = service
+        self.name = model
+        self.input_type = input_type
+
+    def _embed_batches(self, batches):
+        try:
+            results = self.service.embed_batches(batches, self.name, self.input_type)
+        except Exception as e:
+            raise RuntimeError(f"Cohere embed API call failed: {e}")
+        return [_float_embeddings(embeddings, len(batch)) for batch, embeddings in zip(batches, results)]
+
+    def embed(self, texts):
+        # Deduplicated, API-sized batches sent concurrently through the CohereService
+        return np.asarray(embed_planned(texts, self._embed_batches), dtype=np.float32)
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9\+#]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the their this to was were "
+    "will with we you your i my me he she they them his her who which what when where how all any can also "
+    "into over such than then there these those not no but if so do did done been being more most other".split()
+)
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature, dim):
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little") % dim
+
+
+class HashingEmbeddingBackend:
+    """Bag of word unigrams and bigrams, hashed into ``dim`` buckets with
+    sublinear term frequency and L2 normalization, computed with NumPy."""
+
+    input_type = "hashing"
+    # Vectors are sparse and non-negative, so some sentence pair almost always has similarity
+    # exactly 0: no minimum-similarity gate. Related sentences typically score 0.2-0.35.
+    unrelated_min_sim = None
+    coverage_sim = 0.2
+
+    def __init__(self, dim=1024):
+        self.dim = dim
+        self.name = f"local-hashing-v1-{dim}"
+
+    def _features(self, text):
+        words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts):
+        rows, cols, vals = [], [], []
+        for row, text in enumerate(texts):
+            for feature, count in Counter(self._features(text)).items():
+                rows.append(row)
+                cols.append(_bucket(feature, self.dim))
+                vals.append(1.0 + math.log(count))
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), np.asarray(vals, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+BACKENDS = ("cohere", "local")
+
+
+def get_backend(name=DEFAULT_BACKEND, service=None):
+    if name == "cohere":
+        if service is None:
+            raise ValueError("The cohere embedding backend needs a CohereService.")
+        return CohereEmbeddingBackend(service)
+    if name == "local":
+        return HashingEmbeddingBackend()
+    raise ValueError(f"Unknown embedding backend: {name!r} (expected one of {', '.join(BACKENDS)})")
@@ -0,0 +1,327 @@
+"""Persistent, content-addressed cache for sentence embeddings.
+
+Vectors live in a memory-mapped float32 matrix per (model, input_type)
+namespace, next to an index that maps sentence hashes to matrix rows in
+least-recently-used order: a JSON snapshot plus an append-only journal of
+newer inserts. Only sentence hashes are stored, never the
+sentence text itself. Processes sharing a cache directory serialize index and
+matrix access through a lock file per namespace.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.environ.get("RESUME_EMBED_CACHE_DIR", os.path.join(".cache", "embeddings"))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("RESUME_EMBED_CACHE_MAX_ENTRIES", "50000"))
+_INITIAL_CAPACITY = 256
+LRU_WRITE_EVERY = 4096  # hits between snapshots that only persist LRU order
+SNAPSHOT_EVERY = 4096  # journaled inserts between index snapshots
+
+
+def sentence_key(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _namespace_dir(root, model, input_type):
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in f"{model}__{input_type}")
+    return os.path.join(root, safe)
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive inter-process lock on ``path`` (created if missing)."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class _Store:
+    """One namespace: a growable float32 memmap plus an LRU index of its rows.
+
+    The index is a JSON snapshot (``index.json``) plus an append-only journal of
+    inserts since that snapshot (``journal.log``, one "key row" line each), so an
+    insert appends a line instead of rewriting the whole index. The snapshot is
+    rewritten every SNAPSHOT_EVERY inserts, when the matrix grows, and to persist
+    LRU order from hits.
+
+    Several processes (the app, batch_screen.py, api_server.py, ...) may share a
+    directory, so every read or write happens under ``locked()``, which first
+    catches up with whatever other processes wrote."""
+
+    def __init__(self, directory, max_entries):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.index_path = os.path.join(directory, "index.json")
+        self.journal_path = os.path.join(directory, "journal.log")
+        self.matrix_path = os.path.join(directory, "vectors.f32")
+        self.lock_path = os.path.join(directory, ".lock")
+        self.touched = OrderedDict()  # keys hit since the snapshot was last written, for LRU order
+        self._seen = None  # (inode, mtime, size) of the index.json we last loaded or wrote
+        self._reset()
+
+    def _reset(self):
+        self.dim = None
+        self.capacity = 0
+        self.rows = OrderedDict()  # key -> row, oldest first
+        self.owners = {}  # row -> key
+        self.next_row = 0  # rows below this are in use; rows are only freed by reuse
+        self.matrix = None
+        self.generation = 0
+        self.journal_pos = None  # bytes of journal.log applied; None if it belongs to an older snapshot
+        self.pending = []  # (key, row) put since the last commit
+        self.journaled = 0  # journal entries since the snapshot
+        self.needs_snapshot = False
+
+    @contextmanager
+    def locked(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with _file_lock(self.lock_path):
+            self._refresh()
+            yield
+
+    def _index_stat(self):
+        try:
+            st = os.stat(self.index_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        seen = self._index_stat()
+        if seen != self._seen:
+            self._load()
+            self._seen = seen
+        else:
+            self._replay_journal()
+
+    def _load(self):
+        self._reset()
+        if not os.path.exists(self.index_path) or not os.path.exists(self.matrix_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim = int(meta["dim"])
+            self.capacity = int(meta["capacity"])
+            self.generation = int(meta.get("generation", 0))
+            for key, row in meta["rows"]:
+                self._assign(key, int(row))
+            self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim))
+        except (OSError, ValueError, KeyError, TypeError):
+            # A corrupt or truncated cache is only a performance problem; start over.
+            self._reset()
+            return
+        self.journal_pos = 0
+        self._replay_journal()
+        for key in self.touched:
+            if key in self.rows:
+                self.rows.move_to_end(key)  # keep this process's recent hits recent
+
+    def _assign(self, key, row):
+        old_key = self.owners.get(row)
+        if old_key is not None and old_key != key:
+            del self.rows[old_key]  # the row was reused for another sentence
+        old_row = self.rows.get(key)
+        if old_row is not None and old_row != row:
+            del self.owners[old_row]
+        self.rows[key] = row
+        self.rows.move_to_end(key)
+        self.owners[row] = key
+        self.next_row = max(self.next_row, row + 1)
+
+    def _replay_journal(self):
+        """Apply journal lines appended (by any process) since we last looked."""
+        if self.journal_pos is None:
+            return
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self.journal_pos)
+                data = f.read()
+        except OSError:
+            data = b""
+        end = data.rfind(b"\n") + 1  # ignore a line still being written
+        lines = data[:end].decode("ascii").splitlines()
+        if self.journal_pos == 0:
+            if not lines or lines[0] != f"generation {self.generation}":
+                # Missing, or left over from an interrupted snapshot: every process ignores it,
+                # and the next commit writes a fresh snapshot and journal
+                self.journal_pos = None
+                return
+            lines = lines[1:]
+        for line in lines:
+            key, row = line.split()
+            if int(row) < self.capacity:
+                self._assign(key, int(row))
+                self.journaled += 1
+        self.journal_pos += end
+
+    def _grow(self, dim):
+        if self.dim is None:
+            self.dim = dim
+        new_capacity = min(max(self.capacity * 2, _INITIAL_CAPACITY), self.max_entries)
+        if new_capacity <= self.capacity:
+            return False
+        tmp_path = self.matrix_path + ".tmp"
+        grown = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(new_capacity, self.dim))
+        if self.matrix is not None:
+            grown[:self.capacity] = self.matrix[:]
+            del self.matrix
+        grown.flush()
+        del grown
+        os.replace(tmp_path, self.matrix_path)
+        self.matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim))
+        self.capacity = new_capacity
+        self.needs_snapshot = True  # other processes must remap the new file
+        return True
+
+    def get(self, key):
+        row = self.rows.get(key)
+        if row is None:
+            return None
+        self.rows.move_to_end(key)
+        self.touched[key] = None
+        return np.array(self.matrix[row])
+
+    def put(self, key, vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.dim is not None and vector.shape[0] != self.dim:
+            raise ValueError(f"Embedding dimension changed from {self.dim} to {vector.shape[0]} for {self.directory}")
+        row = self.rows.get(key)
+        if row is None:
+            if self.next_row < self.capacity or self._grow(vector.shape[0]):
+                row = self.next_row
+            else:
+                row = next(iter(self.rows.values()))  # reuse the least recently used row
+        self._assign(key, row)
+        self.matrix[row] = vector
+        self.pending.append((key, row))
+
+    def commit(self):
+        """Persist puts since the last commit; call under ``locked()``."""
+        if self.matrix is None or not self.pending:
+            return
+        self.matrix.flush()
+        if self.needs_snapshot or self.journal_pos is None or self.journaled + len(self.pending) >= SNAPSHOT_EVERY:
+            self.snapshot()
+            return
+        with open(self.journal_path, "ab") as f:
+            f.write("".join(f"{key} {row}\n" for key, row in self.pending).encode("ascii"))
+            self.journal_pos = f.tell()
+        self.journaled += len(self.pending)
+        self.pending = []
+
+    def snapshot(self):
+        """Rewrite index.json with every row in LRU order and start an empty journal."""
+        if self.matrix is None:
+            return
+        self.matrix.flush()
+        self.generation += 1
+        meta = {"dim": self.dim, "capacity": self.capacity, "generation": self.generation,
+                "rows": list(self.rows.items())}
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.index_path)
+        header = f"generation {self.generation}\n".encode("ascii")
+        with open(self.journal_path + ".tmp", "wb") as f:
+            f.write(header)
+        os.replace(self.journal_path + ".tmp", self.journal_path)
+        self._seen = self._index_stat()
+        self.journal_pos = len(header)
+        self.journaled = 0
+        self.pending = []
+        self.needs_snapshot = False
+        self.touched.clear()
+
+
+class EmbeddingCache:
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+        self.root = root
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def _store(self, model, input_type):
+        ns = (model, input_type)
+        if ns not in self._stores:
+            self._stores[ns] = _Store(_namespace_dir(self.root, model, input_type), self.max_entries)
+        return self._stores[ns]
+
+    def embed(self, texts, model, input_type, embed_fn):
+        """Return a float32 matrix with one row per text, calling
+        ``embed_fn(missing_texts)`` only for sentences not already cached."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        keys = [sentence_key(t) for t in texts]
+        with self._lock:
+            store = self._store(model, input_type)
+            found = {}
+            with store.locked():
+                for key in keys:
+                    if key not in found:
+                        vec = store.get(key)
+                        if vec is not None:
+                            found[key] = vec
+                # Recency from hits alone is written lazily, with the next insert or every LRU_WRITE_EVERY hits
+                if len(store.touched) >= LRU_WRITE_EVERY:
+                    store.snapshot()
+        missing = list(OrderedDict((k, t) for k, t in zip(keys, texts) if k not in found).items())
+        fresh = []
+        if missing:
+            fresh = embed_fn([t for _, t in missing])
+            if len(fresh) != len(missing):
+                raise ValueError("Embedding backend returned a different number of vectors than requested.")
+            fresh = np.asarray(fresh, dtype=np.float32)
+        with self._lock:
+            hits = sum(1 for k in keys if k in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+            if missing:
+                with store.locked():
+                    for (key, _), vec in zip(missing, fresh):
+                        store.put(key, vec)
+                        found[key] = vec
+                    store.commit()
+        return np.stack([found[k] for k in keys])
+
+    def close(self):
+        """Persist LRU order from hits not yet written."""
+        with self._lock:
+            for store in self._stores.values():
+                if store.touched:
+                    with store.locked():
+                        store.snapshot()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "entries": sum(len(s.rows) for s in self._stores.values()),
+            }
@@ -0,0 +1,162 @@
+"""Local stand-in for the Cohere API, for offline development and load tests.
+
+    python fake_cohere.py --port 8787 --latency 0.2 --fail-every 5
+
+then point the app or batch_screen.py at it with COHERE_BASE_URL=http://127.0.0.1:8787.
+Implements POST /v1/embed and POST /v1/generate (including ``"stream": true``
+JSON-lines output). Embeddings are deterministic
+bag-of-words hashes, so related sentences get similar vectors. GET /stats
+returns request counters.
+"""
+import argparse
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBED_DIM = 256
+CANNED_FEEDBACK = (
+    "- Quantify the impact of your most recent role with concrete metrics.\n"
+    "- Mirror the key skills from the job description in your Skills section.\n"
+    "- Lead each bullet point with a strong action verb.\n\n"
+    "Summary: Results-driven engineer with hands-on experience delivering the skills this role asks for.\n\n"
+    "ATS checklist: Use standard section headings. Avoid tables and images. Save as PDF or DOCX. "
+    "Include a Skills section. Keep fonts simple."
+)
+
+
+def fake_embedding(text, dim=EMBED_DIM):
+    vec = [0.0] * dim
+    for word in re.findall(r"[a-z0-9\+#]+", text.lower()):
+        h = int.from_bytes(hashlib.md5(word.encode("utf-8")).digest()[:4], "little")
+        vec[h % dim] += 1.0 if (h >> 31) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+    return [v / norm for v in vec]
+
+
+class FakeCohereHandler(BaseHTTPRequestHandler):
+    server_version = "FakeCohere/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, dict(self.server.stats))
+        else:
+            self._send_json(404, {"message": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.stats["requests"] += 1
+            n = self.server.stats["requests"]
+        if self.server.fail_every and n % self.server.fail_every == 0:
+            with self.server.lock:
+                self.server.stats["throttled"] += 1
+            self._send_json(429, {"message": "rate limited (fake)"}, {"Retry-After": "0"})
+            return
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.path == "/v1/embed":
+            self._embed(payload)
+        elif self.path == "/v1/generate":
+            self._generate(payload)
+        else:
+            self._send_json(404, {"message": "not found"})
+
+    def _embed(self, payload):
+        texts = payload.get("texts") or []
+        if len(texts) > 96:
+            self._send_json(400, {"message": "invalid request: total number of texts must be at most 96"})
+            return
+        with self.server.lock:
+            self.server.stats["embed_calls"] += 1
+            self.server.stats["embedded_texts"] += len(texts)
+        vectors = [fake_embedding(t) for t in texts]
+        if payload.get("embedding_types"):
+            embeddings = {"float": vectors}
+            response_type = "embeddings_by_type"
+        else:
+            embeddings = vectors
+            response_type = "embeddings_floats"
+        self._send_json(200, {
+            "id": str(uuid.uuid4()), "response_type": response_type,
+            "embeddings": embeddings, "texts": texts, "meta": {"api_version": {"version": "1"}},
+        })
+
+    def _generate(self, payload):
+        with self.server.lock:
+            self.server.stats["generate_calls"] += 1
+        gen_id = str(uuid.uuid4())
+        if not payload.get("stream"):
+            self._send_json(200, {
+                "id": gen_id, "prompt": payload.get("prompt", ""),
+                "generations": [{"id": gen_id, "text": CANNED_FEEDBACK}],
+                "meta": {"api_version": {"version": "1"}},
+            })
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/stream+json")
+        self.end_headers()
+        for token in re.findall(r"\S+\s*", CANNED_FEEDBACK):
+            line = {"event_type": "text-generation", "text": token, "is_finished": False}
+            self.wfile.write(json.dumps(line).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if self.server.token_delay:
+                time.sleep(self.server.token_delay)
+        end = {
+            "event_type": "stream-end", "is_finished": True, "finish_reason": "COMPLETE",
+            "response": {"id": gen_id, "generations": [{"id": gen_id, "text": CANNED_FEEDBACK}]},
+        }
+        self.wfile.write(json.dumps(end).encode("utf-8") + b"\n")
+
+
+def start_fake_cohere(host="127.0.0.1", port=0, latency=0.0, token_delay=0.0, fail_every=0, verbose=False):
+    """Start the fake API on a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), FakeCohereHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.token_delay = token_delay
+    server.fail_every = fail_every
+    server.verbose = verbose
+    server.lock = threading.Lock()
+    server.stats = {"requests": 0, "throttled": 0, "embed_calls": 0, "embedded_texts": 0, "generate_calls": 0}
+    threading.Thread(target=server.serve_forever, name="fake-cohere", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Cohere API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each response")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="seconds between streamed tokens")
+    parser.add_argument("--fail-every", type=int, default=0, help="answer every Nth request with HTTP 429")
+    args = parser.parse_args()
+    server, url = start_fake_cohere(args.host, args.port, args.latency, args.token_delay, args.fail_every, verbose=True)
+    print(f"Fake Cohere API listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Document ingestion: PDF/DOCX/TXT text extraction, parallel across pages and files.
+
+Extraction works on in-memory bytes (no temp files). DocumentIngestor fans
+large PDFs out page-range by page-range and batches out file by file over a
+process pool, and remembers results keyed on a hash of the file bytes.
+"""
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+
+import pdfplumber
+import docx2txt
+
+SUPPORTED_EXTENSIONS = ("pdf", "docx", "txt")
+DEFAULT_WORKERS = int(os.environ.get("RESUME_INGEST_WORKERS", "0")) or (os.cpu_count() or 1)
+PAGES_PER_TASK = 4  # PDFs with more pages than this are split across workers
+
+
+def file_extension(filename):
+    return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+
+def _pdf_page_count(data):
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pdf_pages(data, start=0, stop=None):
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [page.extract_text() or '' for page in pdf.pages[start:stop]]
+
+
+def extract_text(filename, data):
+    """Extract text from one document in the current process."""
+    filetype = file_extension(filename)
+    if filetype == "pdf":
+        return "\n".join(_extract_pdf_pages(data))
+    elif filetype == "docx":
+        return docx2txt.process(io.BytesIO(data))
+    elif filetype == "txt":
+        return data.decode("utf-8")
+    raise ValueError(f"Unsupported file type: {filename}")
+
+
+class DocumentIngestor:
+    def __init__(self, max_workers=DEFAULT_WORKERS, cache_size=256):
+        self.max_workers = max(1, max_workers)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # sha256 of file bytes -> extracted text
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: Streamlit calls this from its script-runner threads
+                self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _cached(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        return None
+
+    def _remember(self, key, text):
+        with self._lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def extract(self, filename, data):
+        result = self.extract_many([(filename, data)])[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def extract_many(self, documents):
+        """Extract text for each (filename, bytes) pair. Returns a list, in input
+        order, holding either the text or the exception raised for that file."""
+        documents = list(documents)
+        results = [None] * len(documents)
+        keys = [hashlib.sha256(data).hexdigest() for _, data in documents]
+        jobs = []  # (index, futures, function joining their results into the text)
+        pending = {}  # cache key -> index of the first document with those bytes
+        for i, ((name, data), key) in enumerate(zip(documents, keys)):
+            text = self._cached(key)
+            if text is not None:
+                results[i] = text
+                continue
+            if key in pending:
+                continue
+            pending[key] = i
+            try:
+                filetype = file_extension(name)
+                n_pages = _pdf_page_count(data) if filetype == "pdf" else 1
+                if n_pages > PAGES_PER_TASK and self.max_workers > 1:
+                    parts = [self._executor().submit(_extract_pdf_pages, data, start, start + PAGES_PER_TASK)
+                             for start in range(0, n_pages, PAGES_PER_TASK)]
+                    jobs.append((i, parts, lambda chunks: "\n".join(p for chunk in chunks for p in chunk)))
+                elif filetype == "txt" or len(documents) == 1 or self.max_workers == 1:
+                    # Not worth a round-trip to another process
+                    results[i] = extract_text(name, data)
+                    self._remember(key, results[i])
+                else:
+                    jobs.append((i, [self._executor().submit(extract_text, name, data)], lambda chunks: chunks[0]))
+            except Exception as e:
+                results[i] = e
+        for i, futures, join in jobs:
+            try:
+                results[i] = join([f.result() for f in futures])
+                self._remember(keys[i], results[i])
+            except BrokenProcessPool as e:
+                self.close()  # a worker died; start a fresh pool on the next call
+                results[i] = e
+            except Exception as e:
+                results[i] = e
+        for i, key in enumerate(keys):
+            if results[i] is None and key in pending:
+                results[i] = results[pending[key]]
+        return results
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
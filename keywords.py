@@ -0,0 +1,120 @@
+"""Single-pass keyword matching against a skills taxonomy.
+
+The taxonomy is a JSON object mapping each canonical skill to its aliases,
+e.g. ``{"JavaScript": ["js", "ecmascript"]}``. Every term and alias is
+compiled into one Aho-Corasick automaton, so a scan reads the lowercased text
+once regardless of how many terms the taxonomy holds. Matches must sit on
+word boundaries ("git" does not match "digital").
+"""
+import hashlib
+import json
+import os
+from collections import deque
+from functools import lru_cache
+
+DEFAULT_TAXONOMY_PATH = os.environ.get(
+    "RESUME_SKILLS_TAXONOMY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+)
+
+
+def load_taxonomy(path=DEFAULT_TAXONOMY_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _continues_word(text, i, step):
+    """Whether text[i] belongs to the word beside it: a word character, or a
+    dot inside a dotted name such as "node.js"."""
+    if not 0 <= i < len(text):
+        return False
+    if _is_word_char(text[i]):
+        return True
+    j = i + step
+    return text[i] == "." and 0 <= j < len(text) and _is_word_char(text[j])
+
+
+class KeywordMatcher:
+    def __init__(self, taxonomy):
+        # Trie as parallel lists: goto[state] maps a character to the next state
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # state -> [(canonical, pattern length)]
+        self.terms = sorted(taxonomy)
+        for canonical, aliases in taxonomy.items():
+            for pattern in {canonical.lower(), *(a.lower() for a in aliases)}:
+                if pattern:
+                    self._add(pattern, canonical)
+        self._build_failure_links()
+
+    def _add(self, pattern, canonical):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((canonical, len(pattern)))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text):
+        """Return ``{canonical term: [(start, end), ...]}`` for every whole-word match.
+
+        Offsets index the lowercased text, which lines up with ``text`` for ASCII input."""
+        lowered = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        found = {}
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            if _is_word_char(ch) and _continues_word(lowered, end, 1):
+                continue
+            for canonical, length in out[state]:
+                start = end - length
+                if _is_word_char(lowered[start]) and _continues_word(lowered, start - 1, -1):
+                    continue
+                spans = found.setdefault(canonical, [])
+                if spans and spans[-1][0] <= start < spans[-1][1]:
+                    # Overlapping aliases of one term ("node" inside "node.js") count once
+                    spans[-1] = (min(start, spans[-1][0]), max(end, spans[-1][1]))
+                else:
+                    spans.append((start, end))
+        return found
+
+    def frequencies(self, text):
+        return {term: len(spans) for term, spans in self.scan(text).items()}
+
+
+@lru_cache(maxsize=1)
+def default_matcher():
+    return KeywordMatcher(load_taxonomy())
+
+
+@lru_cache(maxsize=None)
+def taxonomy_fingerprint(path=DEFAULT_TAXONOMY_PATH):
+    """Short content hash of a taxonomy, so scores can record which one they used."""
+    canonical = json.dumps(load_taxonomy(path), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:8]
@@ -0,0 +1,80 @@
+"""Per-stage timing for the analysis pipeline, shared by benchmarks/bench_pipeline.py and the app.
+
+    timer = StageTimer()
+    with timer.stage("embed"):
+        ...
+    timer.summary()  # {"embed": {"count", "p50_ms", "p90_ms", "p99_ms", "mean_ms", "throughput_per_s", ...}}
+
+With ``trace_memory=True`` each stage also records its peak Python heap
+allocation via tracemalloc (NumPy buffers included). Tracing slows
+pure-Python code noticeably, so keep it out of latency measurements, and
+traced stages should not nest.
+"""
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+PERCENTILES = (50, 90, 99)
+
+
+class StageTimer:
+    def __init__(self, trace_memory=False, max_samples=1000):
+        self.trace_memory = trace_memory
+        self.max_samples = max_samples  # per stage; older samples are dropped
+        self._seconds = defaultdict(list)
+        self._peak_bytes = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] - baseline if self.trace_memory else 0
+            if tracing:
+                tracemalloc.stop()
+            self.record(name, elapsed, peak)
+
+    def record(self, name, seconds, peak_bytes=0):
+        with self._lock:
+            samples = self._seconds[name]
+            samples.append(seconds)
+            if len(samples) > self.max_samples:
+                del samples[0]
+            self._peak_bytes[name] = max(self._peak_bytes[name], peak_bytes)
+
+    def reset(self):
+        with self._lock:
+            self._seconds.clear()
+            self._peak_bytes.clear()
+
+    def summary(self):
+        """Stage name -> latency percentiles (ms), mean, throughput and peak memory, in first-seen order."""
+        with self._lock:
+            stages = {name: list(samples) for name, samples in self._seconds.items()}
+            peaks = dict(self._peak_bytes)
+        out = {}
+        for name, samples in stages.items():
+            ms = np.asarray(samples) * 1e3
+            row = {"count": len(samples)}
+            for p in PERCENTILES:
+                row[f"p{p}_ms"] = round(float(np.percentile(ms, p)), 3)
+            row["mean_ms"] = round(float(ms.mean()), 3)
+            total = float(ms.sum()) / 1e3
+            row["throughput_per_s"] = round(len(samples) / total, 2) if total else None
+            if self.trace_memory:
+                row["peak_mb"] = round(peaks.get(name, 0) / 2**20, 3)
+            out[name] = row
+        return out
@@ -0,0 +1,36 @@
+"""Vectorized sentence-similarity helpers used by the match score."""
+import numpy as np
+
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def similarity_matrix(job_embeds, resume_embeds):
+    """Cosine similarity of every (job sentence, resume sentence) pair as a
+    ``len(job_embeds) x len(resume_embeds)`` matrix, from one matrix multiply."""
+    return normalize_rows(job_embeds) @ normalize_rows(resume_embeds).T
+
+
+def top_k(values, k):
+    """The ``k`` largest values, in descending order, without a full sort."""
+    flat = np.ravel(values)
+    if flat.size == 0:
+        return flat
+    k = min(k, flat.size)
+    part = np.argpartition(flat, -k)[-k:]
+    return np.sort(flat[part])[::-1]
+
+
+def best_matches(sims, job_chunks, resume_chunks):
+    """For each JD sentence, the resume sentence that matches it best."""
+    if sims.size == 0:
+        return []
+    best = sims.argmax(axis=1)
+    return [
+        {"job_sentence": job_chunks[j], "resume_sentence": resume_chunks[r], "similarity": float(sims[j, r])}
+        for j, r in enumerate(best)
+    ]
@@ -0,0 +1,96 @@
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api_server import MAX_BODY_BYTES, QueueFull, ScoringService, start_api_server
+from embedding_backends import HashingEmbeddingBackend
+
+
+class GatedService(ScoringService):
+    """``extract`` blocks until the test releases it, so requests pile up in flight."""
+
+    def __init__(self, **kwargs):
+        super().__init__(HashingEmbeddingBackend(), **kwargs)
+        self.release = threading.Event()
+
+    def extract(self, payload):
+        self.release.wait(10)
+        return super().extract(payload)
+
+
+def wait_for(condition):
+    event = threading.Event()
+    for _ in range(200):
+        if condition():
+            return
+        event.wait(0.01)
+    raise AssertionError("condition never became true")
+
+
+def test_identical_requests_are_coalesced():
+    service = GatedService(workers=2)
+    payload = {"resume_text": "Jane Doe\njane@example.com"}
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(service.submit, "extract", payload) for _ in range(8)]
+        wait_for(lambda: service.counters["coalesced"] == 7)
+        service.release.set()
+        results = [f.result() for f in futures]
+    service.close()
+    assert all(r == results[0] for r in results)
+    assert results[0]["fields"]["email"] == "jane@example.com"
+    assert service.counters["computed"] == 1
+
+
+def test_rejects_new_work_when_the_queue_is_full():
+    service = GatedService(workers=1, max_pending=2)
+    with ThreadPoolExecutor(3) as pool:
+        futures = [pool.submit(service.submit, "extract", {"resume_text": f"r{i}"}) for i in range(2)]
+        wait_for(lambda: service.metrics()["pending"] == 2)
+        with pytest.raises(QueueFull):
+            service.submit("extract", {"resume_text": "r2"})
+        # An identical in-flight request still joins instead of being rejected
+        joined = pool.submit(service.submit, "extract", {"resume_text": "r0"})
+        wait_for(lambda: service.counters["coalesced"] == 1)
+        service.release.set()
+        assert joined.result()["text"] == "r0" and futures[1].result()["text"] == "r1"
+    service.close()
+    assert service.counters["rejected"] == 1
+
+
+@pytest.fixture
+def api():
+    service = ScoringService(HashingEmbeddingBackend())
+    server, url = start_api_server(service)
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    yield service, connection
+    connection.close()
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def post(connection, path, body, headers=None):
+    connection.request("POST", path, body, headers or {})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_oversized_bodies_are_refused_before_routing(api):
+    _, connection = api
+    # Only headers are sent; answering without waiting for the body proves it is never read
+    connection.putrequest("POST", "/v1/unknown")
+    connection.putheader("Content-Length", str(MAX_BODY_BYTES + 1))
+    connection.endheaders()
+    assert connection.getresponse().status == 413
+
+
+def test_deeply_nested_json_is_a_client_error(api):
+    service, connection = api
+    status, body = post(connection, "/v1/score", "[" * 100000 + "]" * 100000)
+    assert status == 400 and "nested" in body["error"]
+    assert service.counters["errors"] == 0
+    status, body = post(connection, "/v1/extract", json.dumps({"resume_text": "Jane Doe"}))
+    assert status == 200 and body["text"] == "Jane Doe"
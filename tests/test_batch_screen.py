@@ -0,0 +1,50 @@
+import zipfile
+
+from batch_screen import iter_documents, screen_resumes
+from embedding_backends import HashingEmbeddingBackend
+
+JD = """We are hiring a backend engineer to build data pipelines and REST services.
+Strong Python and SQL skills are required for this role.
+Experience with Kubernetes and AWS infrastructure is a plus."""
+
+STRONG = b"""Jane Doe
+jane@example.com
+Experience
+Built data pipelines in Python and SQL for internal reporting.
+Designed REST services deployed on Kubernetes and AWS infrastructure.
+Skills
+Python, SQL, Kubernetes, AWS"""
+
+WEAK = b"""Maria Rossi
+maria@example.com
+Experience
+Head chef preparing seasonal Italian dishes for two hundred guests nightly.
+Managed a kitchen brigade of twelve cooks and planned weekly menus."""
+
+
+def test_resumes_are_ranked_by_score_with_failures_last():
+    documents = [("weak.txt", WEAK), ("broken.rtf", b"{\\rtf1}"), ("strong.txt", STRONG), ("short.txt", b"Hi")]
+    rows = screen_resumes(HashingEmbeddingBackend(), documents, JD)
+    assert [r["file"] for r in rows] == ["strong.txt", "weak.txt", "broken.rtf", "short.txt"]
+    assert [r["rank"] for r in rows] == [1, 2, 3, 4]
+    strong, weak, broken, short = rows
+    assert strong["score"] > weak["score"]
+    assert strong["name"] == "Jane Doe" and strong["email"] == "jane@example.com"
+    assert "Kubernetes" in strong["skills"] and not strong["error"]
+    assert broken["score"] is None and broken["error"].startswith("Could not extract text")
+    assert short["score"] is None and "too short" in short["error"]
+
+
+def test_zip_members_keep_their_archive_in_the_name(tmp_path):
+    for archive, text in (("a.zip", STRONG), ("b.zip", WEAK)):
+        with zipfile.ZipFile(tmp_path / archive, "w") as z:
+            z.writestr("resume.txt", text)
+            z.writestr("notes.md", b"ignored")
+            z.writestr("folder/", b"")
+    (tmp_path / "c.txt").write_bytes(STRONG)
+    documents = dict(iter_documents([str(tmp_path / "a.zip"), str(tmp_path / "b.zip"), str(tmp_path / "c.txt")]))
+    assert documents == {
+        f"{tmp_path / 'a.zip'}/resume.txt": STRONG,
+        f"{tmp_path / 'b.zip'}/resume.txt": WEAK,
+        str(tmp_path / "c.txt"): STRONG,
+    }
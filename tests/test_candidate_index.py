@@ -0,0 +1,120 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from analysis import split_into_sentences
+from candidate_index import CandidateIndex, index_documents
+from embedding_backends import HashingEmbeddingBackend
+from similarity import normalize_rows
+
+
+def embeds(seed, n=3, dim=8):
+    return np.random.default_rng(seed).normal(size=(n, dim))
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / "index")
+
+
+def test_add_search_and_reload(root):
+    index = CandidateIndex(root, "local")
+    index.add_many([(f"c{i}", embeds(i), {"skills": [f"s{i}"]}, {"python"}) for i in range(20)])
+    results = index.search(embeds(7), frozenset({"python"}), k=3)
+    assert results[0]["id"] == "c7"
+    assert results[0]["fields"] == {"skills": ["s7"]}
+    assert len(results) == 3
+
+    reloaded = CandidateIndex(root, "local")
+    assert len(reloaded) == 20
+    assert reloaded.search(embeds(7), frozenset({"python"}), k=3) == results
+
+
+def test_replace_and_delete(root):
+    index = CandidateIndex(root, "local")
+    index.add("a", embeds(1))
+    index.add("b", embeds(2))
+    index.add("a", embeds(3))  # replaces
+    assert len(index) == 2
+    assert index.search(embeds(3), k=1)[0]["id"] == "a"
+    assert index.delete("b") and not index.delete("b")
+    reloaded = CandidateIndex(root)
+    assert "b" not in reloaded and len(reloaded) == 1
+
+
+def test_compact_drops_deleted_records(root):
+    index = CandidateIndex(root, "local")
+    index.add_many([(f"c{i}", embeds(i), {}, ()) for i in range(5)])
+    index.delete("c1")
+    before = index.search(embeds(3), k=4)
+    index.compact()
+    assert index.search(embeds(3), k=4) == before
+    with open(os.path.join(root, "candidates.jsonl"), encoding="utf-8") as f:
+        ids = [json.loads(line)["id"] for line in f]
+    assert sorted(ids) == ["c0", "c2", "c3", "c4"]
+    assert sorted(os.listdir(os.path.dirname(root))) == ["index"]
+    assert len(CandidateIndex(root)) == 4
+
+
+def test_compact_with_every_candidate_deleted(root):
+    index = CandidateIndex(root, "local")
+    index.add("a", embeds(1))
+    index.delete("a")
+    index.compact()
+    assert len(index) == 0 and index.search(embeds(1)) == []
+    index.add("b", embeds(2))
+    assert len(CandidateIndex(root)) == 1
+
+
+def test_compact_ignores_a_leftover_build_directory(root):
+    index = CandidateIndex(root, "local")
+    index.add("a", embeds(1))
+    os.makedirs(root + ".compact")
+    with open(os.path.join(root + ".compact", "candidates.jsonl"), "w", encoding="utf-8") as f:
+        f.write(json.dumps({"op": "add", "id": "ghost", "start": 0, "end": 1, "fields": {}, "keywords": []}) + "\n")
+    index.compact()
+    assert "ghost" not in CandidateIndex(root)
+
+
+def test_interrupted_compaction_is_rolled_back(root):
+    CandidateIndex(root, "local").add("a", embeds(1))
+    os.replace(root, root + ".old")  # crashed after moving the live index aside
+    assert "a" in CandidateIndex(root)
+
+
+def test_rejects_another_backend_or_scoring_version(root):
+    CandidateIndex(root, "local").add("a", embeds(1))
+    with pytest.raises(ValueError):
+        CandidateIndex(root, "cohere")
+    state_path = os.path.join(root, "state.json")
+    with open(state_path, encoding="utf-8") as f:
+        state = json.load(f)
+    state["scoring_version"] = "0.00000000"
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    with pytest.raises(ValueError, match="scoring version"):
+        CandidateIndex(root)
+
+
+def test_index_documents_embeds_every_resume_in_one_call(root):
+    class CountingBackend(HashingEmbeddingBackend):
+        calls = 0
+
+        def embed(self, texts):
+            CountingBackend.calls += 1
+            return super().embed(texts)
+
+    backend = CountingBackend()
+    documents = [(f"r{i}.txt", f"Candidate {i}\nBuilt data pipelines number {i} in Python and SQL.\n"
+                               f"Led a team of {i} engineers on the billing platform.".encode()) for i in range(5)]
+    documents.append(("short.txt", b"Too short"))
+    index = CandidateIndex(root, backend.name)
+    assert index_documents(index, backend, documents) == 5
+    assert CountingBackend.calls == 1
+    assert sorted(index._by_id) == [f"r{i}.txt" for i in range(5)]
+    record = index._slots[index._by_id["r3.txt"]]
+    assert "name" not in record["fields"] and "email" not in record["fields"]
+    expected = normalize_rows(backend.embed(split_into_sentences(documents[3][1].decode())))
+    assert np.allclose(index._sentences[record["start"]:record["end"]], expected)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from cohere_service import CohereService
+from fake_cohere import fake_embedding, start_fake_cohere
+
+
+@pytest.fixture
+def fake_api():
+    server, url = start_fake_cohere(fail_every=3)
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+
+def test_throttled_requests_are_retried(fake_api):
+    server, url = fake_api
+    service = CohereService("test", base_url=url, max_concurrency=2, backoff_base=0.01)
+    try:
+        batches = [[f"sentence {b} {i}" for i in range(4)] for b in range(6)]
+        results = service.embed_batches(batches, "embed-english-v3.0", "search_document")
+        assert service.generate("prompt", "command", 50, 0.5)
+    finally:
+        service.close()
+    assert service.retries == server.stats["throttled"] > 0
+    for batch, vectors in zip(batches, results):
+        assert np.allclose(vectors.float_, [fake_embedding(t) for t in batch])
+
+
+def test_gives_up_after_max_retries(fake_api):
+    server, url = fake_api
+    server.fail_every = 1
+    service = CohereService("test", base_url=url, max_retries=2, backoff_base=0.01)
+    try:
+        with pytest.raises(Exception) as error:
+            service.embed(["text"], "embed-english-v3.0", "search_document")
+    finally:
+        service.close()
+    assert getattr(error.value, "status_code", None) == 429
+    assert service.retries == 2 and server.stats["requests"] == 3
@@ -0,0 +1,72 @@
+import random
+import re
+
+import analysis
+from document import parse_document
+
+
+def test_sentences_match_the_original_split():
+    original = lambda t: [s.strip() for s in re.split(r"[\n.!?]", t) if len(s.strip()) > 20]
+    rng = random.Random(0)
+    alphabet = list("abcdefg hij. ! ?\n\r\x0c\t ") + [" ", "Skills\n", "Experience: "]
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 150)))
+        assert [s.text for s in parse_document(text).sentences] == original(text)
+
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 555 123 4567
+Summary
+Backend engineer with eight years of experience building payment systems.
+EXPERIENCE
+Software Engineer, Acme Corp (2019-2023)
+- Built payment services in Go and Python.
+Tools: Jira, Docker, Kubernetes
+Software Engineer, Beta Inc (2016-2019)
+- Maintained the billing system in Java.
+Technologies: Spring, Oracle
+EDUCATION
+BSc Computer Science, State University, 2016
+TECHNICAL SKILLS
+Python, Go, Java, PostgreSQL
+Languages: English, Spanish
+PROJECTS
+Open-source rate limiter
+Tech stack: Rust, Redis
+"""
+
+
+def test_sections_of_a_multi_section_resume():
+    document = parse_document(RESUME)
+    assert [s.name for s in document.sections] == ["header", "summary", "experience", "education", "skills", "projects"]
+    assert document.section("skills").heading == "TECHNICAL SKILLS"
+
+
+def test_labelled_lines_inside_a_job_stay_in_experience():
+    assert analysis.extract_experience(RESUME) == [
+        "Software Engineer, Acme Corp (2019-2023)",
+        "- Built payment services in Go and Python.",
+        "Tools: Jira, Docker, Kubernetes",
+        "Software Engineer, Beta Inc (2016-2019)",
+        "- Maintained the billing system in Java.",
+    ]
+    assert analysis.extract_education(RESUME) == ["BSc Computer Science, State University, 2016"]
+    assert analysis.extract_skills(RESUME) == ["Python", "Go", "Java", "PostgreSQL", "English", "Spanish"]
+
+
+def test_every_skills_section_is_read():
+    text = "Jane Doe\nSkills: Python, SQL\nExperience\nBuilt dashboards for the sales team.\nTools\nJira, Figma\n"
+    assert analysis.extract_skills(text) == ["Python", "SQL", "Jira", "Figma"]
+
+
+def test_space_separated_skill_lists_are_split():
+    text = "Skills\nPython SQL AWS Docker React\nMachine Learning Kubernetes\nAWS (S3, Glue), Terraform\n"
+    assert analysis.extract_skills(text) == [
+        "Python", "SQL", "AWS", "Docker", "React", "Machine Learning", "Kubernetes", "AWS (S3, Glue)", "Terraform"]
+
+
+def test_fields():
+    fields = analysis.extract_fields(RESUME)
+    assert fields["name"] == "Jane Doe"
+    assert fields["email"] == "jane.doe@example.com"
+    assert fields["phone"] == "+1 555 123 4567"
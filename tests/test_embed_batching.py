@@ -0,0 +1,40 @@
+from embed_batching import (
+    embed_planned, estimate_tokens, plan_batches, truncate_text, MAX_TOKENS_PER_TEXT, CHARS_PER_TOKEN,
+)
+
+
+def test_duplicates_are_sent_once_and_scattered_back():
+    texts = ["b", "a", "b", "c", "a"]
+    unique_texts, batches, positions = plan_batches(texts)
+    assert unique_texts == ["b", "a", "c"]
+    assert [unique_texts[p] for p in positions] == texts
+    assert sorted(i for batch in batches for i in batch) == [0, 1, 2]
+
+
+def test_batches_respect_text_and_token_limits():
+    texts = [f"sentence {i} " + "word " * (i % 40) for i in range(500)]
+    unique_texts, batches, _ = plan_batches(texts, max_texts=96, max_tokens=2000)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(unique_texts)))
+    for batch in batches:
+        assert len(batch) <= 96
+        assert sum(estimate_tokens(unique_texts[i]) for i in batch) <= 2000
+
+
+def test_embed_planned_returns_vectors_in_input_order():
+    texts = [f"text {i % 7}" for i in range(30)]
+    calls = []
+
+    def embed_batches(batches):
+        calls.append(batches)
+        return [[[float(t.split()[1])] for t in batch] for batch in batches]
+
+    vectors = embed_planned(texts, embed_batches)
+    assert vectors == [[float(i % 7)] for i in range(30)]
+    assert sum(len(b) for b in calls[0]) == 7
+
+
+def test_truncates_long_texts_on_a_word_boundary():
+    text = "word " * (MAX_TOKENS_PER_TEXT * CHARS_PER_TOKEN)
+    cut = truncate_text(text)
+    assert len(cut) <= MAX_TOKENS_PER_TEXT * CHARS_PER_TOKEN
+    assert cut.endswith("word")
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import analysis
+from embedding_backends import CohereEmbeddingBackend, HashingEmbeddingBackend, get_backend
+
+JD = """We are hiring a backend engineer to build data pipelines and REST services.
+Strong Python and SQL skills are required for this role.
+Experience with Kubernetes and AWS infrastructure is a plus.
+You will design reporting dashboards for internal customers."""
+
+RELATED = """Jane Doe
+Skills: Python, SQL, Kubernetes, AWS
+Experience
+Built data pipelines in Python and SQL for internal reporting dashboards.
+Designed REST services deployed on Kubernetes and AWS infrastructure.
+Led the backend engineer team building customer data services."""
+
+PARTLY_RELATED = """John Roe
+Skills: Java, Python
+Experience
+Maintained a Java billing system for a retail company over five years.
+Wrote Python scripts to automate monthly invoice exports."""
+
+UNRELATED = """Maria Rossi
+Experience
+Head chef preparing seasonal Italian dishes for two hundred guests nightly.
+Managed a kitchen brigade of twelve cooks and planned weekly menus."""
+
+
+def score(backend, resume, job_description=JD):
+    return analysis.score_documents(
+        resume, job_description,
+        analysis.embed_document(backend, resume), analysis.embed_document(backend, job_description),
+        backend,
+    )[0]
+
+
+def test_hashing_vectors_are_deterministic_and_normalized():
+    backend = HashingEmbeddingBackend(dim=256)
+    first = backend.embed(["Built data pipelines in Python", "", "Built data pipelines in Python"])
+    assert first.shape == (3, 256) and first.dtype == np.float32
+    assert np.allclose(first[0], first[2])
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+    assert not first[1].any()
+    assert np.array_equal(HashingEmbeddingBackend(dim=256).embed(["Built data pipelines in Python"])[0], first[0])
+
+
+def test_similar_sentences_are_closer():
+    vectors = HashingEmbeddingBackend().embed([
+        "Built data pipelines in Python", "Python data pipelines were built", "Cooked Italian dishes nightly"])
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+
+
+def test_get_backend():
+    assert isinstance(get_backend("local"), HashingEmbeddingBackend)
+    assert isinstance(get_backend("cohere", service=object()), CohereEmbeddingBackend)
+    with pytest.raises(ValueError):
+        get_backend("cohere")
+    with pytest.raises(ValueError):
+        get_backend("nope")
+
+
+def test_local_scores_vary_with_relatedness():
+    backend = get_backend("local")
+    related, partly, unrelated = (score(backend, r) for r in (RELATED, PARTLY_RELATED, UNRELATED))
+    # Sparse hashing vectors always have some zero-similarity pair; that alone must not
+    # squeeze every score into the unrelated band
+    assert related["min_similarity"] == 0.0 and not related["unrelated"]
+    assert related["score"] > analysis.UNRELATED_RANGE[1]
+    assert related["score"] > partly["score"] > unrelated["score"]
+    assert related["coverage"] > partly["coverage"]
+    assert related["version"] == f"{analysis.SCORING_VERSION}+{backend.name}"
+
+
+def test_cohere_thresholds_are_unchanged():
+    sims = np.full((2, 3), 0.5)
+    sims[0, 0] = 0.0
+    keywords = frozenset({"python"})
+    assert analysis.score_breakdown(sims, keywords, keywords)["unrelated"]
+    assert analysis.score_breakdown(sims, keywords, keywords, CohereEmbeddingBackend(None))["unrelated"]
+    assert not analysis.score_breakdown(sims, keywords, keywords, HashingEmbeddingBackend())["unrelated"]
@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import embedding_cache
+from embedding_cache import EmbeddingCache
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def vectors_for(texts):
+    return [np.full(4, float(t.rsplit(" ", 1)[-1]), dtype=np.float32) for t in texts]
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return vectors_for(texts)
+
+
+def test_hits_skip_the_backend(tmp_path):
+    cache, embed = EmbeddingCache(str(tmp_path)), Recorder()
+    first = cache.embed(["s 1", "s 2", "s 1"], "m", "search_document", embed)
+    second = cache.embed(["s 2", "s 1"], "m", "search_document", embed)
+    assert embed.calls == [["s 1", "s 2"]]
+    assert first[:, 0].tolist() == [1, 2, 1]
+    assert second[:, 0].tolist() == [2, 1]
+    assert cache.stats()["hits"] == 2  # a repeat within one call counts as a miss
+
+
+def test_reload_from_disk(tmp_path):
+    EmbeddingCache(str(tmp_path)).embed(["s 1", "s 2"], "m", "q", Recorder())
+    embed = Recorder()
+    reloaded = EmbeddingCache(str(tmp_path))
+    assert reloaded.embed(["s 2", "s 1"], "m", "q", embed)[:, 0].tolist() == [2, 1]
+    assert embed.calls == []
+    # Namespaces (model, input type) are separate
+    reloaded.embed(["s 1"], "m", "other", embed)
+    assert embed.calls == [["s 1"]]
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), max_entries=3)
+    cache.embed(["s 1", "s 2", "s 3"], "m", "q", Recorder())
+    cache.embed(["s 1"], "m", "q", Recorder())  # 2 is now the oldest
+    cache.embed(["s 4"], "m", "q", Recorder())
+    embed = Recorder()
+    reloaded = EmbeddingCache(str(tmp_path), max_entries=3)
+    assert reloaded.embed(["s 1", "s 2", "s 3", "s 4"], "m", "q", embed)[:, 0].tolist() == [1, 2, 3, 4]
+    assert embed.calls == [["s 2"]]
+
+
+def test_dimension_change_is_rejected(tmp_path):
+    cache = EmbeddingCache(str(tmp_path))
+    cache.embed(["s 1"], "m", "q", Recorder())
+    with pytest.raises(ValueError):
+        cache.embed(["s 2"], "m", "q", lambda texts: [np.zeros(8, dtype=np.float32)])
+
+
+def test_instances_sharing_a_directory_never_mix_rows(tmp_path):
+    a, b = EmbeddingCache(str(tmp_path)), EmbeddingCache(str(tmp_path))
+    a.embed(["a 1"], "m", "q", Recorder())
+    b.embed(["b 2"], "m", "q", Recorder())
+    embed = Recorder()
+    assert a.embed(["a 1", "b 2"], "m", "q", embed)[:, 0].tolist() == [1, 2]
+    assert embed.calls == []
+
+
+def test_processes_sharing_a_directory_never_mix_rows(tmp_path):
+    script = f"""
+import sys
+sys.path.insert(0, {REPO_ROOT!r})
+import numpy as np
+from embedding_cache import EmbeddingCache
+cache = EmbeddingCache({str(tmp_path)!r}, max_entries=200)
+worker = int(sys.argv[1])
+embed = lambda texts: [np.full(4, float(t.rsplit(" ", 1)[-1]), dtype=np.float32) for t in texts]
+for i in range(150):
+    text = f"w{{worker}} {{worker * 1000 + i}}"
+    assert cache.embed([text], "m", "q", embed)[0, 0] == worker * 1000 + i
+"""
+    workers = [subprocess.Popen([sys.executable, "-c", script, str(w)]) for w in range(3)]
+    assert [w.wait(timeout=120) for w in workers] == [0, 0, 0]
+
+
+def test_inserts_append_to_the_journal_until_a_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "SNAPSHOT_EVERY", 10)
+    cache = EmbeddingCache(str(tmp_path))
+    cache.embed(["s 0"], "m", "q", Recorder())  # first insert creates the matrix: snapshot
+    directory = os.path.join(str(tmp_path), "m__q")
+    index_before = os.stat(os.path.join(directory, "index.json")).st_mtime_ns
+    for i in range(1, 6):
+        cache.embed([f"s {i}"], "m", "q", Recorder())
+    assert os.stat(os.path.join(directory, "index.json")).st_mtime_ns == index_before
+    with open(os.path.join(directory, "journal.log"), encoding="ascii") as f:
+        assert len(f.read().splitlines()) == 1 + 5  # header + one line per insert
+    for i in range(6, 12):
+        cache.embed([f"s {i}"], "m", "q", Recorder())
+    assert os.stat(os.path.join(directory, "index.json")).st_mtime_ns != index_before
+    embed = Recorder()
+    assert EmbeddingCache(str(tmp_path)).embed([f"s {i}" for i in range(12)], "m", "q", embed)[:, 0].tolist() == list(range(12))
+    assert embed.calls == []
+
+
+def test_a_stale_journal_is_ignored(tmp_path):
+    cache = EmbeddingCache(str(tmp_path))
+    cache.embed(["s 1"], "m", "q", Recorder())
+    cache.embed(["s 2"], "m", "q", Recorder())  # journaled
+    journal = os.path.join(str(tmp_path), "m__q", "journal.log")
+    with open(journal, encoding="ascii") as f:
+        lines = f.read().splitlines()
+    with open(journal, "w", encoding="ascii") as f:  # as if a snapshot was interrupted
+        f.write("\n".join(["generation 0"] + lines[1:]) + "\n")
+    embed = Recorder()
+    reloaded = EmbeddingCache(str(tmp_path))
+    assert reloaded.embed(["s 1", "s 2", "s 3"], "m", "q", embed)[:, 0].tolist() == [1, 2, 3]
+    assert embed.calls == [["s 2", "s 3"]]
+    assert EmbeddingCache(str(tmp_path)).embed(["s 2", "s 3"], "m", "q", Recorder())[:, 0].tolist() == [2, 3]
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from analysis import FeedbackFilter, clean_ai_feedback
+
+SAMPLES = [
+    "- Tip one\n```python\nprint('x')\n```\n- Tip two",
+    'Summary {"json": true} here <b>bold</b> text',
+    "Use <> and backticks ` inline ``not a fence`` too",
+    "Unclosed fence ```never closed",
+    "Unclosed brace { and <tag",
+    "",
+]
+
+
+def _stream(text, cuts):
+    feedback_filter = FeedbackFilter()
+    pieces, start = [], 0
+    for cut in sorted(cuts) + [len(text)]:
+        pieces.append(feedback_filter.feed(text[start:cut]))
+        start = cut
+    return ("".join(pieces) + feedback_filter.flush()).strip()
+
+
+def test_known_output():
+    assert clean_ai_feedback('Keep this {"drop": 1} and <i>this</i>') == "Keep this  and this"
+    assert clean_ai_feedback("a ```code``` b") == "a  b"
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_every_chunking_gives_the_same_output(text):
+    expected = clean_ai_feedback(text)
+    assert _stream(text, range(1, len(text))) == expected  # one character at a time
+    rng = random.Random(0)
+    for _ in range(50):
+        cuts = rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(0, 6))) if len(text) > 1 else []
+        assert _stream(text, cuts) == expected
@@ -0,0 +1,59 @@
+import io
+import zipfile
+
+import pytest
+
+import ingest
+from ingest import DocumentIngestor
+
+
+def docx_bytes(*lines):
+    paragraphs = "".join(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in lines)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("word/document.xml",
+                   '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                   f"<w:body>{paragraphs}</w:body></w:document>")
+    return buf.getvalue()
+
+
+@pytest.fixture(params=[1, 2], ids=["in-process", "process-pool"])
+def ingestor(request):
+    ingestor = DocumentIngestor(max_workers=request.param)
+    yield ingestor
+    ingestor.close()
+
+
+def test_extract_many_keeps_order_and_returns_errors(ingestor):
+    results = ingestor.extract_many([
+        ("a.txt", b"Plain text resume"),
+        ("b.docx", docx_bytes("Jane Doe", "Python developer")),
+        ("c.rtf", b"{\\rtf1}"),
+        ("d.docx", b"not a zip file"),
+        ("e.txt", b"Plain text resume"),
+    ])
+    assert results[0] == results[4] == "Plain text resume"
+    assert "Jane Doe" in results[1] and "Python developer" in results[1]
+    assert isinstance(results[2], ValueError)
+    assert isinstance(results[3], Exception)
+
+
+def test_identical_bytes_are_extracted_once(monkeypatch):
+    calls = []
+
+    def counting_extract(name, data):
+        calls.append(name)
+        return data.decode("utf-8")
+
+    monkeypatch.setattr(ingest, "extract_text", counting_extract)
+    ingestor = DocumentIngestor(max_workers=1)
+    first = ingestor.extract_many([("a.txt", b"same"), ("b.txt", b"same"), ("c.txt", b"other")])
+    assert first == ["same", "same", "other"]
+    assert calls == ["a.txt", "c.txt"]
+    assert ingestor.extract("d.txt", b"same") == "same"  # remembered across calls
+    assert calls == ["a.txt", "c.txt"]
+
+
+def test_extract_raises_for_a_single_bad_file():
+    with pytest.raises(ValueError):
+        DocumentIngestor(max_workers=1).extract("resume.exe", b"MZ")
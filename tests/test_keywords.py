@@ -0,0 +1,35 @@
+from keywords import KeywordMatcher, default_matcher
+
+TAXONOMY = {"Git": [], "Node.js": ["node", "nodejs"], "C++": ["cpp"], "SQL": [], "Machine Learning": ["ml"]}
+
+
+def test_matches_whole_words_only():
+    matcher = KeywordMatcher(TAXONOMY)
+    assert matcher.scan("Digital marketing, legitimate work") == {}
+    assert set(matcher.scan("Used git and SQL daily")) == {"Git", "SQL"}
+
+
+def test_punctuation_and_line_edges_are_boundaries():
+    matcher = KeywordMatcher(TAXONOMY)
+    found = matcher.scan("sql\n(Git), C++; ML.")
+    assert set(found) == {"SQL", "Git", "C++", "Machine Learning"}
+
+
+def test_dotted_names_are_one_word():
+    matcher = KeywordMatcher(TAXONOMY)
+    assert matcher.scan("Built APIs in Node.js") == {"Node.js": [(14, 21)]}
+    assert matcher.scan("node.jsx") == {}
+
+
+def test_overlapping_aliases_count_once():
+    matcher = KeywordMatcher(TAXONOMY)
+    assert matcher.frequencies("Node.js, then nodejs and node") == {"Node.js": 3}
+
+
+def test_multi_word_terms():
+    matcher = KeywordMatcher(TAXONOMY)
+    assert matcher.frequencies("machine learning and machine-learning") == {"Machine Learning": 1}
+
+
+def test_default_taxonomy_loads():
+    assert "Python" in default_matcher().scan("Python developer")
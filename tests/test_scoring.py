@@ -0,0 +1,33 @@
+import numpy as np
+
+import analysis
+
+
+def test_score_breakdown_is_deterministic():
+    sims = np.random.default_rng(0).uniform(-0.2, 0.9, size=(6, 11))
+    resume_keywords, jd_keywords = frozenset({"python", "sql", "aws"}), frozenset({"python", "go"})
+    first = analysis.score_breakdown(sims, resume_keywords, jd_keywords)
+    for _ in range(5):
+        assert analysis.score_breakdown(sims.copy(), frozenset(resume_keywords), frozenset(jd_keywords)) == first
+    assert first["version"] == analysis.SCORING_VERSION
+    assert 0 <= first["score"] <= 100
+
+
+def test_unrelated_pairs_land_in_the_unrelated_band():
+    sims = np.full((3, 4), 0.8)
+    breakdown = analysis.score_breakdown(sims, frozenset({"python"}), frozenset({"cooking"}))
+    low, high = analysis.UNRELATED_RANGE
+    assert breakdown["unrelated"] and low <= breakdown["score"] <= high
+    assert "keyword overlap" in analysis.unrelated_reason(breakdown)
+
+    related = analysis.score_breakdown(sims, frozenset({"python"}), frozenset({"python"}))
+    assert not related["unrelated"] and analysis.unrelated_reason(related) is None
+
+
+def test_coverage_does_not_move_the_score():
+    keywords = frozenset({"python"})
+    # Same similarity values, so the same top-k and minimum; only coverage differs
+    covered = analysis.score_breakdown(np.array([[0.9, 0.3], [0.6, 0.3]]), keywords, keywords)
+    uncovered = analysis.score_breakdown(np.array([[0.9, 0.6], [0.3, 0.3]]), keywords, keywords)
+    assert (covered["coverage"], uncovered["coverage"]) == (1.0, 0.5)
+    assert covered["score"] == uncovered["score"]